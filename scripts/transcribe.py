@@ -8,61 +8,101 @@ and reports success/failure with elapsed time.
 """
 
 import argparse
+import asyncio
+import atexit
+import functools
 import time
-from datetime import datetime
-import boto3
 import os
+import random
+import re
+import secrets
+import socket
 import sys
 import json
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from urllib.parse import urlsplit, urlunsplit
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util import Retry
 
 # Adjust Python path to include src directory
 script_dir = os.path.dirname(os.path.abspath(__file__))
 project_root = os.path.dirname(script_dir)
 sys.path.insert(0, project_root)
 
-# Import modules after adjusting path
-from src.config import AWS_ACCESS_KEY_ID, AWS_SECRET_ACCESS_KEY, AWS_REGION, CONSUL_HOST, CONSUL_PORT
-from src.s3 import download_file, upload_file
-from src.jobs import create_job, get_job_status, update_job_status
+# src modules are imported where they are used (boto3 for --passthrough,
+# consul for --wait consul) so other runs don't pay for loading those SDKs
 
-def get_s3_client():
-    """Initialize and return a boto3 S3 client."""
-    try:
-        s3_client = boto3.client(
-            "s3",
-            aws_access_key_id=AWS_ACCESS_KEY_ID,
-            aws_secret_access_key=AWS_SECRET_ACCESS_KEY,
-            region_name=AWS_REGION,
-        )
-        return s3_client
-    except Exception as e:
-        print(f"Failed to initialize S3 client: {e}")
-        return None
+logger = logging.getLogger(__name__)
+
+# Shared HTTP session so the submit call and every status poll reuse one
+# keep-alive connection instead of opening a new one per request
+_SESSION = requests.Session()
+_ADAPTER = HTTPAdapter(
+    pool_connections=1,
+    pool_maxsize=16,
+    max_retries=Retry(total=3, backoff_factor=0.2, status_forcelist=(502, 503, 504)),
+)
+_SESSION.mount("http://", _ADAPTER)
+_SESSION.mount("https://", _ADAPTER)
+
+# Long polls go through their own session without adapter retries: a retried
+# read timeout would hold the caller for several full waits past its deadline
+_LONG_POLL_SESSION = requests.Session()
+_LONG_POLL_ADAPTER = HTTPAdapter(pool_connections=1, pool_maxsize=16, max_retries=0)
+_LONG_POLL_SESSION.mount("http://", _LONG_POLL_ADAPTER)
+_LONG_POLL_SESSION.mount("https://", _LONG_POLL_ADAPTER)
+
+# (connect, read) timeouts for service requests, in seconds; status reads
+# are quick, so they get a shorter read timeout than job submission
+HTTP_TIMEOUT = (3.05, 30)
+STATUS_TIMEOUT = (3.05, 10)
+
+# Seconds the service may hold a status revalidation open (?wait=) until the
+# job changes; the read timeout of a long poll is its wait plus this grace
+STATUS_LONG_POLL = 30
+LONG_POLL_GRACE = 5
+
+def _long_poll_wait(remaining):
+    """
+    Return (wait, timeout) for a status long poll with `remaining` seconds
+    left before the caller's deadline: the wait never runs past the deadline.
+    """
+    wait = max(1, min(STATUS_LONG_POLL, int(remaining)))
+    return wait, (STATUS_TIMEOUT[0], wait + LONG_POLL_GRACE)
+
+# Job payloads are serialized once by the caller and sent as raw bytes
+JSON_HEADERS = {"Content-Type": "application/json"}
+
+def _encode_payload(payload):
+    """Serialize a request payload to compact JSON bytes."""
+    return json.dumps(payload, separators=(",", ":")).encode("utf-8")
+
+def close_session():
+    """Close the shared HTTP sessions and their pooled connections."""
+    _SESSION.close()
+    _LONG_POLL_SESSION.close()
+
+atexit.register(close_session)
+
+# Set to cancel in-flight waits, e.g. when a --daemon run is interrupted
+_STOP = threading.Event()
+
+# s3://bucket/key - bucket has no slashes or whitespace, key is non-empty and
+# single-line (matched with fullmatch, so a trailing newline is rejected)
+_S3_URI = re.compile(r"s3://([^/\s]+)/(.+)")
 
 def parse_s3_uri(s3_uri):
     """Parse S3 URI into bucket and key."""
-    if not s3_uri.startswith("s3://"):
-        raise ValueError("Invalid S3 URI. Must start with 's3://'")
-    
-    # Remove s3:// prefix
-    s3_path = s3_uri[5:]
-    
-    # Split into bucket and key
-    # Handle cases where there might be multiple slashes
-    parts = s3_path.split("/", 1)
-    if len(parts) != 2:
-        raise ValueError(f"Invalid S3 URI format: {s3_uri}")
-    
-    bucket = parts[0]
-    key = parts[1]
-    
-    # Validate bucket name
-    if not bucket or bucket.strip() == "":
-        raise ValueError(f"Invalid bucket name in S3 URI: {s3_uri}")
-    
-    return bucket, key
+    match = _S3_URI.fullmatch(s3_uri)
+    if not match:
+        raise ValueError(f"Invalid S3 URI: {s3_uri}. Must be formatted as s3://bucket/key")
+    return match.group(1), match.group(2)
 
+@functools.lru_cache(maxsize=8)
 def parse_consul_address(consul_http_addr):
     """
     Parse the CONSUL_HTTP_ADDR environment variable into host and port.
@@ -74,34 +114,9 @@ def parse_consul_address(consul_http_addr):
     if not consul_http_addr:
         return "localhost", 8500
 
-    # Handle http:// format
-    if consul_http_addr.startswith("http://"):
-        # Remove "http://" prefix
-        addr = consul_http_addr[7:]
-        if ":" in addr:
-            host, port_str = addr.split(":", 1)
-            return host, int(port_str)
-        else:
-            return addr, 8500
-
-    # Handle https:// format
-    elif consul_http_addr.startswith("https://"):
-        # Remove "https://" prefix
-        addr = consul_http_addr[8:]
-        if ":" in addr:
-            host, port_str = addr.split(":", 1)
-            return host, int(port_str)
-        else:
-            return addr, 8500
-
-    # Handle simple host:port format
-    elif ":" in consul_http_addr:
-        host, port_str = consul_http_addr.split(":", 1)
-        return host, int(port_str)
-
-    # Just host
-    else:
-        return consul_http_addr, 8500
+    # A bare host[:port] needs a leading "//" for urlsplit to read it as the netloc
+    parts = urlsplit(consul_http_addr if "://" in consul_http_addr else f"//{consul_http_addr}")
+    return parts.hostname, parts.port or 8500
 
 def normalize_service_url(service_url):
     """
@@ -109,50 +124,44 @@ def normalize_service_url(service_url):
     Handles load balancer configurations where the URL contains both
     the load balancer endpoint and the service path.
     """
-    # Remove trailing slashes
-    service_url = service_url.rstrip('/')
-
     # If no scheme is present, assume HTTP
-    if not service_url.startswith(('http://', 'https://')):
-        service_url = f"http://{service_url}"
+    parts = urlsplit(service_url if "://" in service_url else f"http://{service_url}")
 
-    return service_url
+    # Remove trailing slashes
+    return urlunsplit((parts.scheme, parts.netloc, parts.path.rstrip("/"), parts.query, parts.fragment))
 
-def call_transcription_api(service_url, input_s3_path, output_s3_path, webhook_url=None, consul_key=None, consul_notification=False, debug=False):
+@functools.lru_cache(maxsize=8)
+def _build_urls(service_url):
     """
-    Call the transcription API endpoint to initiate a transcription job.
+    Derive the job submission URL and the status URL template from the
+    service URL. Both endpoints share the same base, so the derivation is
+    done once per service URL and cached.
+    Returns (api_url, status_url_template); format the template with job_id.
     """
-    # Normalize the service URL
-    normalized_url = normalize_service_url(service_url)
-    
+    parts = urlsplit(normalize_service_url(service_url))
+
     # For load balancer scenarios, we need to preserve the structure
     # If the URL is like "http://fabio.service.consul:9999/transcribe"
     # We want to make it "http://fabio.service.consul:9999/transcribe/transcribe"
+    # so the base is everything in the path before the /transcribe route
+    base_path = parts.path.split("/transcribe", 1)[0].rstrip("/")
+    base_url = urlunsplit((parts.scheme, parts.netloc, base_path, "", ""))
+
+    # The final URLs should be:
+    # http://fabio.service.consul:9999/transcribe/transcribe
+    # http://fabio.service.consul:9999/transcribe/status/{job_id}
+    api_url = f"{base_url}/transcribe/transcribe"
+    status_url_template = f"{base_url}/transcribe/status/{{job_id}}"
+
+    return api_url, status_url_template
+
+def call_transcription_api(service_url, input_s3_path, output_s3_path, webhook_url=None, consul_key=None, consul_notification=False):
+    """
+    Call the transcription API endpoint to initiate a transcription job.
+    """
+    api_url, _ = _build_urls(service_url)
     
-    # Extract the base URL part (before /transcribe)
-    base_url = normalized_url
-    if '/transcribe' in normalized_url:
-        # Remove the /transcribe part to get the base URL
-        if normalized_url.endswith('/transcribe'):
-            base_url = normalized_url[:-len('/transcribe')]
-        else:
-            # Find the position of /transcribe and split
-            pos = normalized_url.find('/transcribe')
-            base_url = normalized_url[:pos]
-    
-    # Construct the final API endpoint
-    # The final URL should be: http://fabio.service.consul:9999/transcribe/transcribe
-    if base_url.endswith('/'):
-        api_url = f"{base_url}transcribe/transcribe"
-    else:
-        api_url = f"{base_url}/transcribe/transcribe"
-    
-    # Ensure we don't have double slashes
-    if '//transcribe' in api_url:
-        api_url = api_url.replace('//transcribe', '/transcribe')
-    
-    if debug:
-        print(f"DEBUG: Final API URL: {api_url}")
+    logger.debug("Final API URL: %s", api_url)
     
     payload = {
         "input_s3_path": input_s3_path,
@@ -167,21 +176,21 @@ def call_transcription_api(service_url, input_s3_path, output_s3_path, webhook_u
     if consul_notification:
         payload["consul_notification"] = consul_notification
     
-    if debug:
-        print(f"DEBUG: Making POST request to {api_url}")
-        print(f"DEBUG: Request payload: {payload}")
+    body = _encode_payload(payload)
+    logger.debug("Making POST request to %s", api_url)
+    logger.debug("Request payload: %s", body)
     
     try:
-        response = requests.post(api_url, json=payload)
-        if debug:
-            print(f"DEBUG: Response status code: {response.status_code}")
-            print(f"DEBUG: Response headers: {dict(response.headers)}")
-            print(f"DEBUG: Response body: {response.text}")
-            # Log the payload being sent
-            print(f"DEBUG: Payload sent: {json.dumps(payload, indent=2)}")
+        response = _SESSION.post(api_url, data=body, headers=JSON_HEADERS, timeout=HTTP_TIMEOUT)
+        logger.debug("Response status code: %s", response.status_code)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Response headers: %s", dict(response.headers))
+            logger.debug("Response body: %s", response.text)
         
         if response.status_code == 200:
-            return response.json()
+            # Parse the raw bytes; json detects UTF-8 itself, which skips
+            # requests' charset guessing on the response text
+            return json.loads(response.content)
         else:
             print(f"Failed to initiate transcription: {response.status_code} - {response.text}")
             return None
@@ -189,188 +198,749 @@ def call_transcription_api(service_url, input_s3_path, output_s3_path, webhook_u
         print(f"Error calling transcription API: {e}")
         return None
 
-def wait_for_job_completion_polling(service_url, job_id, timeout=300, debug=False):
+# Status polling starts fast and backs off for long-running jobs, in seconds
+POLL_INTERVAL_MIN = 0.5
+POLL_INTERVAL_MAX = 10.0
+POLL_BACKOFF_FACTOR = 1.5
+
+# After a failed request the next attempt waits this long, doubling on each
+# consecutive failure up to ERROR_BACKOFF_MAX and resetting on success
+ERROR_BACKOFF_MIN = 2.0
+ERROR_BACKOFF_MAX = 30.0
+
+def _jittered(interval):
+    """Spread an interval by +/-20% so many clients don't poll in lockstep."""
+    return interval * random.uniform(0.8, 1.2)
+
+def _may_be_terminal(headers, body):
     """
-    Poll the service for job completion status.
+    Return whether a status response can hold a terminal status. Uses the
+    service's X-Job-Status header when present, else scans the raw body,
+    so non-terminal responses are never JSON-decoded.
     """
-    # Normalize the service URL
-    normalized_url = normalize_service_url(service_url)
-
-    # Remove any trailing slashes
-    normalized_url = normalized_url.rstrip('/')
+    status = headers.get("X-Job-Status")
+    if status is not None:
+        return status in ("completed", "failed")
+    return b'"completed"' in body or b'"failed"' in body
 
-    # Construct the final status endpoint - avoid duplication
-    # If the URL already ends with /transcribe, we need to remove it to get base URL
-    if normalized_url.endswith('/transcribe'):
-        base_url = normalized_url[:-len('/transcribe')]
-    else:
-        base_url = normalized_url
+# Status codes that won't change on retry: the job is unknown or we may not see it
+TERMINAL_STATUS_CODES = (401, 403, 404)
 
-    # Construct the final status endpoint
-    # The status URL should be: http://fabio.service.consul:9999/transcribe/status/{job_id}
-    if base_url.endswith('/'):
-        status_url = f"{base_url}transcribe/status/{job_id}"
-    else:
-        status_url = f"{base_url}/transcribe/status/{job_id}"
+def _retry_after(headers):
+    """Return the Retry-After delay in seconds from a 429 response, if given."""
+    try:
+        return float(headers.get("Retry-After"))
+    except (TypeError, ValueError):
+        return None
 
-    # Ensure we don't have double slashes
-    if '//transcribe' in status_url:
-        status_url = status_url.replace('//transcribe', '/transcribe')
+def wait_for_job_completion_polling(service_url, job_id, timeout=300):
+    """
+    Poll the service for job completion status.
+    """
+    _, status_url_template = _build_urls(service_url)
+    status_url = status_url_template.format(job_id=job_id)
 
-    if debug:
-        print(f"DEBUG: Polling status endpoint: {status_url}")
+    logger.debug("Polling status endpoint: %s", status_url)
 
-    start_time = datetime.now()
-    while (datetime.now() - start_time).seconds < timeout:
+    deadline = time.monotonic() + timeout
+    last_etag = None
+    interval = POLL_INTERVAL_MIN
+    error_backoff = ERROR_BACKOFF_MIN
+    while time.monotonic() < deadline:
+        if _STOP.is_set():
+            return "cancelled", None
         try:
-            response = requests.get(status_url)
-            if debug:
-                print(f"DEBUG: Status poll response status code: {response.status_code}")
-                if response.status_code != 200:
-                    print(f"DEBUG: Status poll response body: {response.text}")
-
-            if response.status_code == 200:
-                data = response.json()
+            # Conditional long poll: once we hold an ETag, the service keeps the
+            # request open until the job changes, answering 304 if it never does
+            if last_etag:
+                wait, long_poll_timeout = _long_poll_wait(deadline - time.monotonic())
+                request_start = time.monotonic()
+                response = _LONG_POLL_SESSION.get(status_url, params={"wait": wait},
+                                                  headers={"If-None-Match": last_etag}, timeout=long_poll_timeout)
+                # A 304 that came back well before the wait means the service
+                # didn't hold the request (no long-poll support); back off instead
+                held = time.monotonic() - request_start >= wait / 2
+                if response.status_code == 304 and held and not _STOP.is_set():
+                    continue
+            else:
+                response = _SESSION.get(status_url, timeout=STATUS_TIMEOUT)
+            logger.debug("Status poll response status code: %s", response.status_code)
+            if response.status_code in (200, 304):
+                error_backoff = ERROR_BACKOFF_MIN
+            elif logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Status poll response body: %s", response.text)
+
+            # Only decode the body once it can hold a terminal status
+            if response.status_code == 200 and _may_be_terminal(response.headers, response.content):
+                last_etag = response.headers.get("ETag")
+                data = json.loads(response.content)
                 status = data.get("status")
 
-                if debug:
-                    print(f"DEBUG: Job status: {status}")
-                    print(f"DEBUG: Full status data: {data}")
+                logger.debug("Job status: %s", status)
+                logger.debug("Full status data: %s", data)
 
                 if status == "completed":
                     return "completed", data.get("result")
                 elif status == "failed":
                     return "failed", data.get("result")
-
-            # Wait before polling again
-            time.sleep(2)
+            elif response.status_code == 200:
+                last_etag = response.headers.get("ETag")
+            elif response.status_code in TERMINAL_STATUS_CODES:
+                return "failed", {"error": f"{response.status_code} - {response.text}"}
+            elif response.status_code == 429:
+                # Throttled - wait as long as the service asks before the next poll
+                interval = max(_retry_after(response.headers) or 0, interval)
+            elif response.status_code != 304:
+                # Error response - back off further while the service keeps failing
+                interval = error_backoff
+                error_backoff = min(error_backoff * 2, ERROR_BACKOFF_MAX)
         except Exception as e:
-            if debug:
-                print(f"DEBUG: Error polling job status: {e}")
-            time.sleep(2)
+            logger.debug("Error polling job status: %s", e)
+            interval = error_backoff
+            error_backoff = min(error_backoff * 2, ERROR_BACKOFF_MAX)
+
+        # Wait before polling again, waking immediately on shutdown
+        if _STOP.wait(_jittered(interval)):
+            return "cancelled", None
+        interval = min(interval * POLL_BACKOFF_FACTOR, POLL_INTERVAL_MAX)
     
     return "timeout", None
 
-def wait_for_job_completion_consul(consul_key, timeout=300, debug=False):
+# Upper bound for a single Consul blocking query, in seconds
+CONSUL_BLOCKING_WAIT = 300
+
+# (connect, read) timeouts for Consul requests. The read timeout has to
+# outlast a blocking query, which Consul may hold up to wait/16 past its wait
+CONSUL_TIMEOUT = (3.05, CONSUL_BLOCKING_WAIT + 30)
+
+# Key prefix the service writes job notifications under (see src/main.py)
+CONSUL_JOB_PREFIX = "services/video-transcription/"
+
+def _decode_consul_status(value):
     """
-    Check Consul key directly for job completion status.
+    Decode a job notification value from Consul. The service writes either
+    a plain "completed"/"failed" string or a JSON object with "status" and
+    "result". Returns (status, result) for a terminal status, else None.
+    """
+    try:
+        logger.debug("Raw value: %r", value)
+
+        # Check if the value is a simple string like "completed"
+        stripped = value.strip()
+        if stripped == b"completed":
+            logger.debug("Simple string 'completed' detected")
+            return "completed", None
+        elif stripped == b"failed":
+            logger.debug("Simple string 'failed' detected")
+            return "failed", None
+
+        # Parse the JSON to check status; json.loads takes the bytes directly
+        result_data = json.loads(value)
+        status = result_data.get("status")
+        logger.debug("Status from Consul: %s", status)
+        if status in ("completed", "failed"):
+            return status, result_data.get("result")
+    except Exception as e:
+        logger.debug("Error parsing Consul data: %s", e)
+    return None
+
+@functools.lru_cache(maxsize=4)
+def _get_consul_client(host, port):
+    """Return a Consul client for host:port, built once and reused."""
+    import consul
+
+    # python-consul lets CONSUL_HTTP_ADDR override host/port and only accepts
+    # it in host:port form, so keep the variable consistent with our parse
+    if os.getenv("CONSUL_HTTP_ADDR"):
+        os.environ["CONSUL_HTTP_ADDR"] = f"{host}:{port}"
+    logger.debug("Creating Consul client for %s:%s", host, port)
+    return consul.Consul(host=host, port=port, timeout=CONSUL_TIMEOUT)
+
+def wait_for_job_completion_consul(consul_key, timeout=300, service_url=None, job_id=None, consul_http_addr=None):
+    """
+    Wait on the Consul key for job completion status using blocking queries.
+
+    Each request carries the last seen X-Consul-Index so Consul holds the
+    connection open until the key changes (or the wait window elapses)
+    instead of being re-read on a fixed interval. If Consul itself returns
+    a server error and service_url/job_id are given, fall back to polling
+    the service status endpoint for the remaining time.
+
+    consul_http_addr overrides the CONSUL_HTTP_ADDR environment variable.
     """
     try:
         # Import consul after ensuring it's available
         import consul
 
-        # Fix for CONSUL_HTTP_ADDR environment variable parsing issue
-        # The python-consul library expects CONSUL_HTTP_ADDR to be in host:port format
-        # but the user has it set to http://10.0.1.12:8500
-        # We'll sanitize the environment variable before creating the Consul client
-
-        # Get CONSUL_HTTP_ADDR from environment
-        consul_http_addr = os.getenv("CONSUL_HTTP_ADDR", "")
-
-        # If CONSUL_HTTP_ADDR is set to a URL format, sanitize it
-        if consul_http_addr and consul_http_addr.startswith("http"):
-            # Remove protocol prefix to make it compatible with python-consul
-            if consul_http_addr.startswith("http://"):
-                sanitized_addr = consul_http_addr[7:]  # Remove "http://"
-            elif consul_http_addr.startswith("https://"):
-                sanitized_addr = consul_http_addr[8:]  # Remove "https://"
-            else:
-                sanitized_addr = consul_http_addr
+        host, port = parse_consul_address(consul_http_addr or os.getenv("CONSUL_HTTP_ADDR"))
+        consul_client = _get_consul_client(host, port)
 
-            # Set the sanitized version for the consul library
-            os.environ["CONSUL_HTTP_ADDR"] = sanitized_addr
-            if debug:
-                print(f"DEBUG: Sanitized CONSUL_HTTP_ADDR from '{consul_http_addr}' to '{sanitized_addr}'")
-
-        # Create Consul client - this should now work with the sanitized environment
-        try:
-            consul_client = consul.Consul()
-            if debug:
-                print("DEBUG: Successfully created Consul client with sanitized environment")
-        except Exception as e:
-            if debug:
-                print(f"DEBUG: Failed to create Consul client with sanitized env: {e}")
-                print("DEBUG: Falling back to localhost:8500")
-            # Fall back to default Consul client with localhost:8500
-            consul_client = consul.Consul(host="localhost", port=8500)
-
-        start_time = datetime.now()
-        while (datetime.now() - start_time).seconds < timeout:
+        deadline = time.monotonic() + timeout
+        index = None
+        last_modify_index = None
+        # Delay before retrying a failed query; grows while Consul keeps failing
+        retry_interval = ERROR_BACKOFF_MIN
+        while time.monotonic() < deadline:
+            if _STOP.is_set():
+                return "cancelled", None
+            # Block on the key until it changes, bounded by the remaining time
+            remaining = deadline - time.monotonic()
+            wait = f"{max(1, min(int(remaining), CONSUL_BLOCKING_WAIT))}s"
             try:
-                # Check if the key exists and has a value
-                index, data = consul_client.kv.get(consul_key)
+                # The first query (index=None) returns immediately; later ones
+                # only return once the key's modify index moves past `index`
+                new_index, data = consul_client.kv.get(consul_key, index=index, wait=wait)
+                retry_interval = ERROR_BACKOFF_MIN
 
-                if debug:
-                    print(f"DEBUG: Consul key check - Index: {index}, Data: {data}")
+                logger.debug("Consul key check - Index: %s, Data: %s", new_index, data)
 
-                # If data is not None, it means the key exists
+                # Consul can reset its index (e.g. after a snapshot restore);
+                # if it goes backwards, start over with a non-blocking read
+                new_index = int(new_index)
+                index = new_index if index is None or new_index >= index else None
+
+                # A blocking query that hit its wait time returns the same entry
+                # again; only decode the value when it has actually been modified
                 if data is not None:
-                    # Decode the data if it's bytes
-                    if isinstance(data, dict) and 'Value' in data:
-                        value = data['Value']
-                        if value is not None:
-                            # Try to decode the value
-                            try:
-                                decoded_value = value.decode('utf-8')
-                                if debug:
-                                    print(f"DEBUG: Decoded value: {decoded_value}")
-
-                                # Check if the value is a simple string like "completed"
-                                if decoded_value.strip() == "completed":
-                                    if debug:
-                                        print("DEBUG: Simple string 'completed' detected")
-                                    return "completed", None
-                                elif decoded_value.strip() == "failed":
-                                    if debug:
-                                        print("DEBUG: Simple string 'failed' detected")
-                                    return "failed", None
-                                else:
-                                    # Parse the JSON to check status
-                                    result_data = json.loads(decoded_value)
-                                    status = result_data.get("status")
-
-                                    if debug:
-                                        print(f"DEBUG: Status from Consul: {status}")
-
-                                    if status == "completed":
-                                        return "completed", result_data.get("result")
-                                    elif status == "failed":
-                                        return "failed", result_data.get("result")
-                            except Exception as e:
-                                if debug:
-                                    print(f"DEBUG: Error parsing Consul data: {e}")
-                                if debug:
-                                    print(f"DEBUG: Error parsing Consul data: {e}")
-
-                # Wait before checking again
-                time.sleep(2)
+                    if data.get("ModifyIndex") == last_modify_index:
+                        continue
+                    last_modify_index = data.get("ModifyIndex")
+
+                # If data is not None, it means the key exists
+                if data is not None and data.get("Value") is not None:
+                    outcome = _decode_consul_status(data["Value"])
+                    if outcome:
+                        return outcome
+            except consul.ConsulException as e:
+                # Consul server error (5xx) - fall back to polling the service
+                logger.debug("Consul server error: %s", e)
+                if service_url and job_id:
+                    remaining = deadline - time.monotonic()
+                    print("Consul unavailable, falling back to status polling...")
+                    return wait_for_job_completion_polling(service_url, job_id, timeout=remaining)
+                if _STOP.wait(_jittered(retry_interval)):
+                    return "cancelled", None
+                retry_interval = min(retry_interval * 2, ERROR_BACKOFF_MAX)
             except Exception as e:
-                if debug:
-                    print(f"DEBUG: Error checking Consul key: {e}")
-                time.sleep(2)
+                logger.debug("Error checking Consul key: %s", e)
+                if _STOP.wait(_jittered(retry_interval)):
+                    return "cancelled", None
+                retry_interval = min(retry_interval * 2, ERROR_BACKOFF_MAX)
 
         return "timeout", None
     except Exception as e:
         print(f"Error initializing Consul client: {e}")
-        # Print more detailed error information
-        import traceback
-        if debug:
-            traceback.print_exc()
+        # Log more detailed error information
+        logger.debug("Consul client initialization failed", exc_info=True)
         return "failed", "Failed to initialize Consul client"
 
-def main():
+def _delete_consul_keys(consul_client, keys, prefix=None):
+    """
+    Remove notification keys once read, so they don't accumulate under the
+    shared prefix. A batch's own subprefix is removed in one recursive call;
+    anything else is deleted key by key. Best effort.
+    """
+    try:
+        if prefix and prefix != CONSUL_JOB_PREFIX:
+            consul_client.kv.delete(prefix, recurse=True)
+        else:
+            for key in keys:
+                consul_client.kv.delete(key)
+    except Exception as e:
+        logger.debug("Error deleting Consul keys: %s", e)
+
+def wait_for_jobs_consul(consul_keys, timeout=300, consul_http_addr=None):
+    """
+    Wait for several jobs at once with one recursive blocking query on the
+    batch's Consul subprefix (see POST /transcribe/batch), so each change
+    costs a single request no matter how many jobs are outstanding, and
+    other clients' jobs neither wake nor bloat the query.
+
+    consul_keys maps job_id to the consul_key the service returned.
+    Returns {job_id: (status, result)}; jobs still pending at the deadline
+    are reported as "timeout". The batch's keys are deleted afterwards.
+    """
+    pending = {key: job_id for job_id, key in consul_keys.items()}
+    outcomes = {}
+    if not pending:
+        return outcomes
+    # Every key of a batch lives directly under the same subprefix
+    prefix = os.path.commonprefix([key.rsplit("/", 1)[0] + "/" for key in pending])
+    try:
+        host, port = parse_consul_address(consul_http_addr or os.getenv("CONSUL_HTTP_ADDR"))
+        consul_client = _get_consul_client(host, port)
+    except Exception as e:
+        print(f"Error initializing Consul client: {e}")
+        logger.debug("Consul client initialization failed", exc_info=True)
+        return {job_id: ("failed", "Failed to initialize Consul client") for job_id in consul_keys}
+
+    deadline = time.monotonic() + timeout
+    index = None
+    retry_interval = ERROR_BACKOFF_MIN
+    try:
+        while pending and time.monotonic() < deadline and not _STOP.is_set():
+            remaining = deadline - time.monotonic()
+            wait = f"{max(1, min(int(remaining), CONSUL_BLOCKING_WAIT))}s"
+            try:
+                new_index, entries = consul_client.kv.get(prefix, recurse=True, index=index, wait=wait)
+                retry_interval = ERROR_BACKOFF_MIN
+
+                # Same index-reset handling as wait_for_job_completion_consul
+                new_index = int(new_index)
+                index = new_index if index is None or new_index >= index else None
+
+                for entry in entries or ():
+                    job_id = pending.get(entry["Key"])
+                    if job_id and entry.get("Value") is not None:
+                        outcome = _decode_consul_status(entry["Value"])
+                        if outcome:
+                            outcomes[job_id] = outcome
+                            del pending[entry["Key"]]
+            except Exception as e:
+                logger.debug("Error checking Consul prefix: %s", e)
+                if _STOP.wait(_jittered(retry_interval)):
+                    break
+                retry_interval = min(retry_interval * 2, ERROR_BACKOFF_MAX)
+    finally:
+        _delete_consul_keys(consul_client, consul_keys.values(), prefix)
+
+    for job_id in pending.values():
+        outcomes[job_id] = ("timeout", None)
+    return outcomes
+
+class _WebhookHandler(BaseHTTPRequestHandler):
+    """Accept the service's job notification POST and wake the waiting thread."""
+
+    def do_POST(self):
+        # The path carries a random token only the service was given
+        if self.path != self.server.path:
+            self.send_response(404)
+            self.end_headers()
+            return
+        body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        try:
+            data = json.loads(body)
+        except ValueError:
+            data = None
+        if not isinstance(data, dict) or data.get("status") not in ("completed", "failed"):
+            self.send_response(400)
+            self.end_headers()
+            return
+
+        self.send_response(200)
+        self.end_headers()
+        # Recorded by job_id; the waiter only accepts its own job's result.
+        # The callback can arrive before the submit response tells us the id
+        with self.server.results_changed:
+            self.server.results[data.get("job_id")] = data
+            self.server.results_changed.notify_all()
+
+    def log_message(self, format, *args):
+        logger.debug("Webhook server: " + format, *args)
+
+def _local_address_for(service_url):
+    """Return the local IP address this host uses to reach the service."""
+    api_url, _ = _build_urls(service_url)
+    parts = urlsplit(api_url)
+    # Connecting a UDP socket only selects a route; no packet is sent
+    with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as sock:
+        sock.connect((parts.hostname, parts.port or 80))
+        return sock.getsockname()[0]
+
+def start_webhook_server(service_url, callback_host=None):
+    """
+    Start a callback server on an ephemeral port in a daemon thread.
+    Returns (server, webhook_url); pass webhook_url with the job and hand
+    the server to wait_for_job_completion_webhook.
+
+    The server listens only on the local interface that routes to the
+    service, and only accepts POSTs to a random per-run path. callback_host
+    overrides the advertised address (e.g. a NAT address forwarded to it).
+    """
+    local_address = _local_address_for(service_url)
+    server = HTTPServer((local_address, 0), _WebhookHandler)
+    server.path = f"/done/{secrets.token_urlsafe(16)}"
+    server.results = {}
+    server.results_changed = threading.Condition()
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    host = callback_host or local_address
+    webhook_url = f"http://{host}:{server.server_port}{server.path}"
+    logger.debug("Webhook server listening at %s", webhook_url)
+    return server, webhook_url
+
+# While waiting for a webhook, the status endpoint is still checked this
+# often, in seconds, in case the callback cannot reach this host
+WEBHOOK_CHECK_INTERVAL = 30
+
+def _fetch_job_status(service_url, job_id):
+    """
+    Fetch a job's status once. Returns (status, result) with result shaped
+    as in the status endpoint, or (None, None) on a transient error.
+    """
+    _, status_url_template = _build_urls(service_url)
+    try:
+        response = _SESSION.get(status_url_template.format(job_id=job_id), timeout=STATUS_TIMEOUT)
+    except requests.RequestException as e:
+        logger.debug("Error fetching job status: %s", e)
+        return None, None
+    if response.status_code in TERMINAL_STATUS_CODES:
+        return "failed", {"error": f"{response.status_code} - {response.text}"}
+    if response.status_code != 200:
+        return None, None
+    try:
+        data = json.loads(response.content)
+    except ValueError as e:
+        # Not JSON (e.g. a proxy error page or a truncated body); try again later
+        logger.debug("Invalid status response: %s", e)
+        return None, None
+    return data.get("status"), data.get("result")
+
+def wait_for_job_completion_webhook(server, job_id, timeout=300, service_url=None):
+    """
+    Wait for the service to POST job_id's terminal status to the callback
+    server, then shut the server down. If service_url is given, the status
+    endpoint is also checked every WEBHOOK_CHECK_INTERVAL seconds so an
+    unreachable callback address doesn't turn into a full timeout.
+    """
+    try:
+        deadline = time.monotonic() + timeout
+        while True:
+            with server.results_changed:
+                arrived = server.results_changed.wait_for(
+                    lambda: job_id in server.results,
+                    max(0, min(WEBHOOK_CHECK_INTERVAL, deadline - time.monotonic())),
+                )
+            if arrived:
+                break
+            if time.monotonic() >= deadline:
+                return "timeout", None
+            if service_url:
+                status, result = _fetch_job_status(service_url, job_id)
+                if status in ("completed", "failed"):
+                    logger.debug("Job %s finished without a callback", job_id)
+                    return status, result
+        # Same result shape as the status endpoint, whichever path answered
+        data = server.results[job_id]
+        if data.get("status") == "completed":
+            return "completed", {"output_s3_path": data.get("output_s3_path")}
+        return "failed", {"error": data.get("error")}
+    finally:
+        server.shutdown()
+        server.server_close()
+
+def read_batch_file(path):
+    """
+    Read (input_s3_path, output_s3_path) pairs from a batch file.
+    Each non-empty line holds an input and an output S3 URI separated by
+    whitespace; lines starting with '#' are ignored.
+    """
+    pairs = []
+    with open(path) as f:
+        for line_number, line in enumerate(f, 1):
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            fields = line.split()
+            if len(fields) != 2:
+                raise ValueError(f"Line {line_number}: expected '<input_s3_path> <output_s3_path>'")
+            parse_s3_uri(fields[0])
+            parse_s3_uri(fields[1])
+            pairs.append((fields[0], fields[1]))
+    return pairs
+
+async def submit_job_async(session, service_url, input_s3_path, output_s3_path, consul_notification=False):
+    """
+    Submit one transcription job without blocking the event loop.
+    Returns (job_id, error); job_id is None when submission failed.
+    """
+    import aiohttp
+
+    api_url, _ = _build_urls(service_url)
+    payload = {
+        "input_s3_path": input_s3_path,
+        "output_s3_path": output_s3_path
+    }
+    if consul_notification:
+        payload["consul_notification"] = True
+    try:
+        async with session.post(api_url, data=_encode_payload(payload), headers=JSON_HEADERS) as response:
+            if response.status != 200:
+                return None, f"{response.status} - {await response.text()}"
+            job_id = (await response.json()).get("job_id")
+    except (aiohttp.ClientError, ValueError) as e:
+        return None, f"Error calling transcription API: {e}"
+
+    logger.debug("Started job %s for %s", job_id, input_s3_path)
+    return job_id, None
+
+async def submit_batch_async(session, service_url, pairs, consul_notification=False):
+    """
+    Submit every (input_s3_path, output_s3_path) pair in one POST
+    /transcribe/batch request. Returns a list of (job_id, consul_key, error)
+    in the order of pairs; job_id is None when submission failed.
+    """
+    import aiohttp
+
+    api_url, _ = _build_urls(service_url)
+    payload = {"jobs": [
+        {"input_s3_path": input_s3_path, "output_s3_path": output_s3_path,
+         "consul_notification": consul_notification}
+        for input_s3_path, output_s3_path in pairs
+    ]}
+    try:
+        async with session.post(f"{api_url}/batch", data=_encode_payload(payload), headers=JSON_HEADERS) as response:
+            if response.status != 200:
+                error = f"{response.status} - {await response.text()}"
+                return [(None, None, error)] * len(pairs)
+            jobs = (await response.json())["jobs"]
+    except (aiohttp.ClientError, ValueError, KeyError) as e:
+        return [(None, None, f"Error calling transcription API: {e}")] * len(pairs)
+
+    return [(job.get("job_id"), job.get("consul_key"), None) for job in jobs]
+
+async def transcribe_one_async(session, service_url, input_s3_path, output_s3_path, timeout=300):
+    """
+    Submit one transcription job and poll it to completion without blocking
+    the event loop. Returns (job_id, status, result).
+    """
+    import aiohttp
+
+    job_id, error = await submit_job_async(session, service_url, input_s3_path, output_s3_path)
+    if not job_id:
+        return None, "failed", error
+
+    _, status_url_template = _build_urls(service_url)
+
+    status_url = status_url_template.format(job_id=job_id)
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    interval = POLL_INTERVAL_MIN
+    last_etag = None
+    error_backoff = ERROR_BACKOFF_MIN
+    while loop.time() < deadline:
+        try:
+            # Conditional long poll, as in wait_for_job_completion_polling
+            if last_etag:
+                wait, (connect_timeout, read_timeout) = _long_poll_wait(deadline - loop.time())
+                long_poll_timeout = aiohttp.ClientTimeout(sock_connect=connect_timeout, sock_read=read_timeout)
+                request = session.get(status_url, params={"wait": wait},
+                                      headers={"If-None-Match": last_etag}, timeout=long_poll_timeout)
+            else:
+                wait = None
+                request = session.get(status_url)
+            request_start = loop.time()
+            async with request as response:
+                if response.status == 304 and wait and loop.time() - request_start >= wait / 2:
+                    continue
+                if response.status in (200, 304):
+                    error_backoff = ERROR_BACKOFF_MIN
+                if response.status == 200:
+                    last_etag = response.headers.get("ETag")
+                    body = await response.read()
+                    # Only decode the body once it can hold a terminal status
+                    if _may_be_terminal(response.headers, body):
+                        data = json.loads(body)
+                        status = data.get("status")
+                        if status in ("completed", "failed"):
+                            return job_id, status, data.get("result")
+                elif response.status in TERMINAL_STATUS_CODES:
+                    return job_id, "failed", {"error": f"{response.status} - {await response.text()}"}
+                elif response.status == 429:
+                    interval = max(_retry_after(response.headers) or 0, interval)
+                elif response.status != 304:
+                    logger.debug("Status poll for %s returned %s", job_id, response.status)
+                    interval = error_backoff
+                    error_backoff = min(error_backoff * 2, ERROR_BACKOFF_MAX)
+        except (aiohttp.ClientError, ValueError) as e:
+            # ValueError: a body that isn't JSON (proxy error page, truncated read)
+            logger.debug("Error polling job %s: %s", job_id, e)
+            interval = error_backoff
+            error_backoff = min(error_backoff * 2, ERROR_BACKOFF_MAX)
+        await asyncio.sleep(_jittered(interval))
+        interval = min(interval * POLL_BACKOFF_FACTOR, POLL_INTERVAL_MAX)
+
+    return job_id, "timeout", None
+
+async def main_async(service_url, batch_file, timeout=300, wait="poll", consul_http_addr=None):
+    """
+    Run every job listed in batch_file concurrently and report each outcome.
+    With wait="consul", all jobs are submitted in one batch request and
+    watched through one recursive Consul query on the batch's subprefix
+    instead of being polled individually.
+    """
+    import aiohttp
+
+    try:
+        pairs = read_batch_file(batch_file)
+    except (OSError, ValueError) as e:
+        print(f"Error reading batch file: {e}")
+        return 1
+
+    print(f"Submitting {len(pairs)} transcription jobs to {normalize_service_url(service_url)}...")
+    start_time = time.perf_counter()
+    connector = aiohttp.TCPConnector(limit=50)
+    client_timeout = aiohttp.ClientTimeout(sock_connect=HTTP_TIMEOUT[0], sock_read=HTTP_TIMEOUT[1])
+    async with aiohttp.ClientSession(connector=connector, timeout=client_timeout) as session:
+        if wait == "consul":
+            submissions = await submit_batch_async(session, service_url, pairs, consul_notification=True)
+            consul_keys = {job_id: consul_key for job_id, consul_key, _ in submissions if job_id and consul_key}
+            waited = await asyncio.to_thread(wait_for_jobs_consul, consul_keys, timeout, consul_http_addr)
+            outcomes = [
+                (job_id, *waited.get(job_id, ("failed", "No Consul key returned for job")))
+                if job_id else (None, "failed", error)
+                for job_id, _, error in submissions
+            ]
+        else:
+            outcomes = await asyncio.gather(*[
+                transcribe_one_async(session, service_url, input_s3_path, output_s3_path, timeout)
+                for input_s3_path, output_s3_path in pairs
+            ])
+    elapsed_time = time.perf_counter() - start_time
+
+    failures = 0
+    for (input_s3_path, output_s3_path), (job_id, status, result) in zip(pairs, outcomes):
+        print(f"{status.upper()}: {input_s3_path} -> {output_s3_path} (job {job_id})")
+        if status != "completed":
+            failures += 1
+            if result:
+                print(f"  Error details: {result}")
+    print(f"{len(pairs) - failures}/{len(pairs)} jobs completed in {elapsed_time:.2f} seconds")
+    return 1 if failures else 0
+
+def process_job(service_url, input_s3_path, output_s3_path, timeout=300):
+    """
+    Submit one transcription job and poll it to completion.
+    Returns (job_id, status, result).
+    """
+    api_response = call_transcription_api(service_url, input_s3_path, output_s3_path)
+    if not api_response or not api_response.get("job_id"):
+        return None, "failed", "Failed to initiate transcription job"
+    job_id = api_response["job_id"]
+    status, result = wait_for_job_completion_polling(service_url, job_id, timeout=timeout)
+    return job_id, status, result
+
+def _warm_up_session(service_url, pool_size):
+    """
+    Size the shared session's connection pool for pool_size concurrent
+    requests and open a keep-alive connection with a health check, so the
+    first job does not pay for connection setup.
+    """
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max(pool_size, 16), max_retries=_ADAPTER.max_retries)
+    _SESSION.mount("http://", adapter)
+    _SESSION.mount("https://", adapter)
+    long_poll_adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max(pool_size, 16), max_retries=0)
+    _LONG_POLL_SESSION.mount("http://", long_poll_adapter)
+    _LONG_POLL_SESSION.mount("https://", long_poll_adapter)
+
+    api_url, _ = _build_urls(service_url)
+    health_url = api_url.rsplit("/", 1)[0] + "/health"
+    try:
+        _SESSION.get(health_url, timeout=STATUS_TIMEOUT)
+    except requests.RequestException as e:
+        logger.debug("Connection warm-up failed: %s", e)
+
+def run_daemon(service_url, max_workers=4, timeout=300):
+    """
+    Long-lived mode: read {"input": ..., "output": ...} JSON lines from stdin
+    and process them on a thread pool. All jobs share this process's HTTP
+    session, so start-up and connection setup are paid once rather than per
+    file. One JSON result line is written to stdout per job as it finishes.
+    """
+    _warm_up_session(service_url, max_workers)
+    output_lock = threading.Lock()
+
+    def report(record):
+        with output_lock:
+            print(json.dumps(record), flush=True)
+
+    def run(job):
+        # A future's exception is never looked at, so anything raised here
+        # must still produce this job's result line
+        try:
+            job_id, status, result = process_job(service_url, job["input"], job["output"], timeout)
+        except Exception as e:
+            logger.debug("Job for %s failed: %s", job["input"], e, exc_info=True)
+            report({**job, "status": "failed", "error": str(e)})
+            return
+        report({**job, "job_id": job_id, "status": status, "result": result})
+
+    executor = ThreadPoolExecutor(max_workers=max_workers)
+    try:
+        for line in sys.stdin:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                job = json.loads(line)
+                parse_s3_uri(job["input"])
+                parse_s3_uri(job["output"])
+            except (ValueError, KeyError, TypeError) as e:
+                report({"line": line, "status": "failed", "error": f"Invalid job: {e}"})
+                continue
+            executor.submit(run, job)
+        executor.shutdown()
+    except KeyboardInterrupt:
+        # Drop queued jobs and wake every worker out of its poll wait
+        _STOP.set()
+        executor.shutdown(cancel_futures=True)
+        return 130
+    return 0
+
+def _build_parser():
+    """Build the command-line argument parser."""
     parser = argparse.ArgumentParser(description="Transcribe audio file via service API")
-    parser.add_argument("--service-url", required=True, help="URL of the transcription service (e.g., fabio.service.consul:9999)")
-    parser.add_argument("--input-s3-path", required=True, help="Input S3 path (s3://bucket/key)")
-    parser.add_argument("--output-s3-path", required=True, help="Output S3 path (s3://bucket/key)")
+    parser.add_argument("--service-url", help="URL of the transcription service (e.g., fabio.service.consul:9999); required unless --passthrough")
+    parser.add_argument("--input-s3-path", help="Input S3 path (s3://bucket/key)")
+    parser.add_argument("--output-s3-path", help="Output S3 path (s3://bucket/key)")
+    parser.add_argument("--batch-file", help="File of '<input_s3_path> <output_s3_path>' lines to transcribe concurrently")
+    parser.add_argument("--daemon", action="store_true",
+                       help='Read {"input": ..., "output": ...} JSON lines from stdin until EOF')
+    parser.add_argument("--max-workers", type=int, default=4, help="Concurrent jobs in --daemon mode (default: 4)")
     parser.add_argument("--webhook-url", help="Webhook URL for notifications")
     parser.add_argument("--consul-key", help="Consul key for notifications")
-    parser.add_argument("--wait", choices=["poll", "consul"], default="poll", 
-                       help="Wait method: poll (default) or consul")
+    parser.add_argument("--wait", choices=["poll", "consul", "webhook"], default="poll", 
+                       help="Wait method: poll (default), consul, or webhook (local callback server)")
+    parser.add_argument("--callback-host",
+                       help="Address the service uses to reach this host with --wait webhook (default: auto-detected)")
     parser.add_argument("--consul-http-addr", help="Consul HTTP address (overrides CONSUL_HTTP_ADDR)")
+    parser.add_argument("--passthrough", action="store_true",
+                       help="Copy the input to the output path server-side without transcribing; "
+                            "talks to S3 directly (boto3 and AWS_* credentials), not to the service")
     parser.add_argument("--debug", "-d", action="store_true", help="Enable debug output")
-    
-    args = parser.parse_args()
+    return parser
+
+# Built once at import so repeated main() calls (e.g. from an orchestrator
+# importing this module) reuse it
+_PARSER = _build_parser()
+
+def main(argv=None):
+    args = _PARSER.parse_args(argv)
+
+    # Debug output goes through logging so messages are only formatted when enabled
+    logging.basicConfig(
+        level=logging.DEBUG if args.debug else logging.WARNING,
+        format="%(levelname)s: %(message)s",
+        force=True,
+    )
+
+    if args.passthrough:
+        if args.daemon or args.batch_file:
+            _PARSER.error("--passthrough copies a single object; it cannot be combined with --daemon or --batch-file")
+    elif not args.service_url:
+        _PARSER.error("--service-url is required unless --passthrough is given")
+
+    if args.daemon:
+        if args.wait != "poll":
+            _PARSER.error("--daemon always polls; --wait consul and --wait webhook are not supported with it")
+        return run_daemon(args.service_url, max_workers=args.max_workers, timeout=300)
+    if args.batch_file:
+        if args.wait == "webhook":
+            _PARSER.error("--wait webhook is not supported with --batch-file")
+        return asyncio.run(main_async(args.service_url, args.batch_file, timeout=300,
+                                      wait=args.wait, consul_http_addr=args.consul_http_addr))
+    if not (args.input_s3_path and args.output_s3_path):
+        _PARSER.error("--input-s3-path and --output-s3-path are required unless --batch-file or --daemon is given")
     
     # Parse S3 URIs
     try:
@@ -395,19 +965,41 @@ def main():
         print("Please ensure S3 URIs are formatted correctly as s3://bucket/key")
         return 1
     
+    # Passthrough: relocate the object with a server-side copy, no bytes pass through this host
+    if args.passthrough:
+        from src.s3 import copy_file
+
+        print(f"Copying {args.input_s3_path} to {args.output_s3_path}...")
+        start_time = time.perf_counter()
+        if not copy_file(input_bucket, input_key, output_bucket, output_key):
+            print("Copy failed!")
+            return 1
+        print(f"Copy completed in {time.perf_counter() - start_time:.2f} seconds")
+        return 0
+
     # Normalize service URL for display
     normalized_service_url = normalize_service_url(args.service_url)
     
+    # With --wait webhook, the service calls back a local server instead of being polled
+    webhook_url = args.webhook_url
+    if args.wait == "webhook":
+        if args.webhook_url:
+            _PARSER.error("--webhook-url cannot be combined with --wait webhook, which supplies its own callback URL")
+        try:
+            webhook_server, webhook_url = start_webhook_server(args.service_url, args.callback_host)
+        except OSError as e:
+            print(f"Failed to start webhook callback server: {e}")
+            return 1
+
     # Initiate transcription via API
     print(f"Initiating transcription via service at {normalized_service_url}...")
     api_response = call_transcription_api(
         args.service_url, 
         args.input_s3_path, 
         args.output_s3_path,
-        args.webhook_url,
+        webhook_url,
         args.consul_key,
-        args.wait == "consul",  # Set consul_notification to True when --wait consul is used
-        args.debug
+        args.wait == "consul"  # Set consul_notification to True when --wait consul is used
     )
     
     if not api_response:
@@ -429,7 +1021,7 @@ def main():
     print(f"Started transcription job: {job_id}")
     
     # Wait for job completion
-    start_time = datetime.now()
+    start_time = time.perf_counter()
     print("Waiting for job completion...")
     
     # Determine wait method
@@ -442,19 +1034,27 @@ def main():
         status, result = wait_for_job_completion_consul(
             consul_key,
             timeout=300,
-            debug=args.debug
+            service_url=args.service_url,
+            job_id=job_id,
+            consul_http_addr=args.consul_http_addr
+        )
+    elif args.wait == "webhook":
+        print(f"Waiting for callback at {webhook_url}...")
+        status, result = wait_for_job_completion_webhook(
+            webhook_server,
+            timeout=300,
+            service_url=args.service_url,
+            job_id=job_id
         )
     else:
         # Use polling method (default)
         status, result = wait_for_job_completion_polling(
             args.service_url, 
             job_id, 
-            timeout=300, 
-            debug=args.debug
+            timeout=300
         )
     
-    end_time = datetime.now()
-    elapsed_time = (end_time - start_time).total_seconds()
+    elapsed_time = time.perf_counter() - start_time
     
     # Enhanced reporting of results with more detail
     if status == "completed":
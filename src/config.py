@@ -4,6 +4,10 @@ import os
 AWS_ACCESS_KEY_ID = os.getenv("AWS_ACCESS_KEY_ID")
 AWS_SECRET_ACCESS_KEY = os.getenv("AWS_SECRET_ACCESS_KEY")
 AWS_REGION = os.getenv("AWS_REGION", "us-east-1")
+# Custom S3 endpoint URL (for non-AWS S3); unset uses AWS
+S3_ENDPOINT = os.getenv("S3_ENDPOINT")
+# Parallel ranged requests per multipart S3 transfer; raise on fast (10GbE+) hosts
+S3_MAX_CONCURRENCY = int(os.getenv("S3_MAX_CONCURRENCY", 10))
 
 # Consul Configuration
 CONSUL_HOST = os.getenv("CONSUL_HOST", "localhost")
@@ -13,3 +17,45 @@ CONSUL_PORT = int(os.getenv("CONSUL_PORT", 8500))
 APP_HOST = os.getenv("APP_HOST", "0.0.0.0")
 APP_PORT = int(os.getenv("APP_PORT", 8000))
 ROOT_PATH = os.getenv("ROOT_PATH", "")
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
+
+# Transcription jobs run at the same time; further jobs wait in a queue
+TRANSCRIBE_WORKERS = int(os.getenv("TRANSCRIBE_WORKERS", 1))
+# Extra jobs that may download their input or upload their result while
+# others are transcribing
+PREFETCH_JOBS = int(os.getenv("PREFETCH_JOBS", 1))
+# Directory for inputs too large to buffer in memory; point at a tmpfs
+# (e.g. /dev/shm) to keep them off disk. Empty uses the system temp dir
+SPOOL_DIR = os.getenv("SPOOL_DIR", "")
+
+# Where finished transcripts are cached by model settings and input ETag
+# (s3://bucket/prefix), so repeated requests for the same input are copied
+# instead of re-transcribed; empty disables the cache
+RESULT_CACHE_S3_PATH = os.getenv("RESULT_CACHE_S3_PATH", "")
+
+# Whisper Configuration
+# Model size or path (tiny, base, small, medium, large-v3, ...)
+WHISPER_MODEL = os.getenv("WHISPER_MODEL", "base")
+# Device to run on: cpu, cuda, or auto (cuda when available)
+WHISPER_DEVICE = os.getenv("WHISPER_DEVICE", "auto")
+# CTranslate2 compute type (e.g. int8, int8_float16, float16, float32); empty
+# picks float16 on GPU and int8 on CPU
+WHISPER_COMPUTE_TYPE = os.getenv("WHISPER_COMPUTE_TYPE", "")
+# 30 s windows decoded together by the batched pipeline; 0 decodes them one
+# at a time. Empty batches 16 windows on GPU and none on CPU. Batching needs
+# the VAD filter; with it off, windows are always decoded one at a time
+WHISPER_BATCH_SIZE = os.getenv("WHISPER_BATCH_SIZE", "")
+# Skip non-speech audio (Silero VAD) before it reaches the model
+WHISPER_VAD_FILTER = os.getenv("WHISPER_VAD_FILTER", "true").lower() in ("1", "true", "yes")
+# Silence, in milliseconds, that splits speech regions for the VAD filter
+WHISPER_VAD_MIN_SILENCE_MS = int(os.getenv("WHISPER_VAD_MIN_SILENCE_MS", 500))
+# CPU threads per transcription; 0 splits the CPUs available to the process
+# evenly between uvicorn workers (WEB_CONCURRENCY) and TRANSCRIBE_WORKERS
+WHISPER_CPU_THREADS = int(os.getenv("WHISPER_CPU_THREADS", 0))
+WEB_CONCURRENCY = int(os.getenv("WEB_CONCURRENCY", 1))
+
+# Job Store Configuration
+# Redis URL for a job store shared by all replicas; empty keeps jobs in process memory
+REDIS_URL = os.getenv("REDIS_URL", "")
+# Seconds a job's status is kept after it is created
+JOB_TTL = int(os.getenv("JOB_TTL", 24 * 60 * 60))
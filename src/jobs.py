@@ -1,49 +1,222 @@
-import uuid
-from datetime import datetime, timedelta
+import asyncio
+import json
+import threading
+import time
+from collections import OrderedDict
+from secrets import token_hex
 import logging
-import os
-
-# Setup logging with custom formatting
-log_level = os.getenv("LOG_LEVEL", "INFO").upper()
-logging.basicConfig(
-    level=getattr(logging, log_level),
-    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
-)
+
+from src.config import JOB_TTL, REDIS_URL
+
+# Handlers and levels are configured by the application entry point (src/main.py)
 logger = logging.getLogger(__name__)
 
-# Configure specific loggers to avoid excessive logs
-logging.getLogger("urllib3").setLevel(logging.WARNING)
+# Insertion order is creation order, so expired jobs are always at the front
+jobs = OrderedDict()
+# Guards `jobs`: status handlers read it while background tasks update it
+_jobs_lock = threading.RLock()
+
+# Seconds a Redis command or connection attempt may take before failing, so
+# an unreachable Redis fails requests instead of hanging them
+REDIS_TIMEOUT = 5
+
+# With REDIS_URL set, jobs are stored in Redis (key job:<id>, expiring after
+# JOB_TTL) so every replica sees every job; otherwise they live in `jobs`.
+# Store calls block, so async callers run them in a threadpool
+if REDIS_URL:
+    import redis
+
+    _redis = redis.Redis.from_url(
+        REDIS_URL,
+        decode_responses=True,
+        socket_timeout=REDIS_TIMEOUT,
+        socket_connect_timeout=REDIS_TIMEOUT,
+    )
+else:
+    _redis = None
+
+# Every status update is published here (message: job ID), so long-polling
+# readers on any replica are woken when another replica updates a job
+JOB_UPDATES_CHANNEL = "job-updates"
+
+# Safety net for a Redis-backed long poll: re-read the job this often in
+# case an update message was missed while the subscriber was reconnecting
+STORE_RECHECK_INTERVAL = 15.0
 
-jobs = {}
+# Long-polling status readers, per job: (event loop, asyncio.Event) pairs
+# that update_job_status wakes from whichever thread it runs on
+_waiters = {}
+_waiters_lock = threading.Lock()
+
+# Subscriber thread relaying JOB_UPDATES_CHANNEL to local waiters; started by
+# the first Redis-backed long poll
+_subscriber = None
 
 def create_job():
     """Creates a new job with a unique ID and processing status."""
-    job_id = str(uuid.uuid4())
-    jobs[job_id] = {
-        "status": "processing",
-        "created_at": datetime.utcnow(),
-    }
-    logger.info(f"JOB CREATED: Job ID={job_id}")
-    return job_id
+    return create_jobs(1)[0]
+
+def create_jobs(count):
+    """
+    Creates `count` jobs in processing status and returns their IDs.
+    With Redis, all jobs are written in one pipelined round-trip.
+    """
+    # Expiring here keeps the dict bounded; it only touches expired entries
+    cleanup_jobs()
+    # 128 random bits, as in a UUID4, formatted as 32 hex characters
+    job_ids = [token_hex(16) for _ in range(count)]
+    created_at = time.time()
+    if _redis is not None:
+        job = json.dumps({"status": "processing", "created_at": created_at})
+        pipe = _redis.pipeline(transaction=False)
+        for job_id in job_ids:
+            pipe.set(f"job:{job_id}", job, ex=JOB_TTL)
+        pipe.execute()
+    else:
+        with _jobs_lock:
+            for job_id in job_ids:
+                jobs[job_id] = {
+                    "status": "processing",
+                    "created_at": created_at,
+                }
+    for job_id in job_ids:
+        logger.info("JOB CREATED: Job ID=%s", job_id)
+    return job_ids
 
 def get_job_status(job_id):
     """Retrieves the status of a job."""
-    return jobs.get(job_id)
+    if _redis is not None:
+        data = _redis.get(f"job:{job_id}")
+        return json.loads(data) if data else None
+    # Return a snapshot so a concurrent update can't be seen half-applied
+    with _jobs_lock:
+        job = jobs.get(job_id)
+        return dict(job) if job is not None else None
 
 def update_job_status(job_id, status, result=None):
     """Updates the status of a job."""
-    if job_id in jobs:
-        jobs[job_id]["status"] = status
+    if _redis is not None:
+        job = get_job_status(job_id)
+        if job is None:
+            return False
+        job["status"] = status
         if result:
-            jobs[job_id]["result"] = result
-        logger.info(f"JOB STATUS UPDATE: Job ID={job_id}, Status={status}")
-        return True
-    return False
+            job["result"] = result
+        # Keep the expiry set when the job was created, and wake long polls
+        # on every replica in the same round trip
+        pipe = _redis.pipeline(transaction=False)
+        pipe.set(f"job:{job_id}", json.dumps(job), keepttl=True)
+        pipe.publish(JOB_UPDATES_CHANNEL, job_id)
+        pipe.execute()
+    else:
+        with _jobs_lock:
+            if job_id not in jobs:
+                return False
+            jobs[job_id]["status"] = status
+            if result:
+                jobs[job_id]["result"] = result
+    logger.info("JOB STATUS UPDATE: Job ID=%s, Status=%s", job_id, status)
+    _notify_waiters(job_id)
+    return True
+
+def _notify_waiters(job_id=None):
+    """Wake every long-polling reader of job_id, or of every job if None."""
+    with _waiters_lock:
+        if job_id is None:
+            waiters = [waiter for job_waiters in _waiters.values() for waiter in job_waiters]
+        else:
+            waiters = list(_waiters.get(job_id, ()))
+    for loop, event in waiters:
+        try:
+            loop.call_soon_threadsafe(event.set)
+        except RuntimeError:
+            # The waiter's loop has closed (e.g. during shutdown); a status
+            # update must never fail because of a reader that is gone
+            pass
+
+def _relay_job_updates():
+    """Wake local waiters for every update published by any replica."""
+    while True:
+        try:
+            pubsub = _redis.pubsub(ignore_subscribe_messages=True)
+            pubsub.subscribe(JOB_UPDATES_CHANNEL)
+            # Updates may have been missed while (re)connecting; waiters
+            # re-read their job when woken, so waking them all is safe
+            _notify_waiters()
+            while True:
+                message = pubsub.get_message(timeout=REDIS_TIMEOUT)
+                if message is not None:
+                    _notify_waiters(message["data"])
+        except redis.RedisError as e:
+            logger.warning("Job update subscription failed, reconnecting: %s", e)
+            time.sleep(1)
+        except Exception:
+            # Anything else would end the thread while _subscriber still
+            # looks alive, leaving long polls on the recheck interval only
+            logger.exception("Unexpected error in job update subscription, reconnecting")
+            time.sleep(1)
+
+def _ensure_subscriber():
+    """Start the update subscriber thread once per process."""
+    global _subscriber
+    with _waiters_lock:
+        if _subscriber is None:
+            _subscriber = threading.Thread(target=_relay_job_updates, name="job-updates", daemon=True)
+            _subscriber.start()
+
+async def wait_for_job_update(job_id, status, timeout):
+    """
+    Wait until the job's status differs from `status` or timeout seconds
+    pass. Returns True if the job changed.
+    """
+    loop = asyncio.get_running_loop()
+    event = asyncio.Event()
+    waiter = (loop, event)
+    if _redis is not None:
+        _ensure_subscriber()
+    with _waiters_lock:
+        _waiters.setdefault(job_id, []).append(waiter)
+    deadline = loop.time() + timeout
+    try:
+        while True:
+            # Registered before this check, so an update racing with it still wakes us
+            event.clear()
+            if _redis is not None:
+                job = await loop.run_in_executor(None, get_job_status, job_id)
+            else:
+                job = get_job_status(job_id)
+            if job is None or job["status"] != status:
+                return True
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                return False
+            try:
+                if _redis is not None:
+                    remaining = min(remaining, STORE_RECHECK_INTERVAL)
+                # Woken by an update (possibly of another field); re-check
+                await asyncio.wait_for(event.wait(), remaining)
+            except asyncio.TimeoutError:
+                pass
+    finally:
+        with _waiters_lock:
+            waiters = _waiters.get(job_id, [])
+            waiters.remove(waiter)
+            if not waiters:
+                _waiters.pop(job_id, None)
 
 def cleanup_jobs():
-    """Removes jobs older than 24 hours."""
-    cutoff = datetime.utcnow() - timedelta(hours=24)
-    for job_id, job in list(jobs.items()):
-        if job["created_at"] < cutoff:
-            del jobs[job_id]
-            logger.info(f"JOB CLEANUP: Removed expired job ID={job_id}")
+    """Removes jobs older than JOB_TTL seconds; Redis expires its own."""
+    if _redis is not None:
+        return
+    cutoff = time.time() - JOB_TTL
+    expired = []
+    with _jobs_lock:
+        # Pop from the oldest end and stop at the first job still in date
+        while jobs:
+            job_id, job = next(iter(jobs.items()))
+            if job["created_at"] >= cutoff:
+                break
+            jobs.popitem(last=False)
+            expired.append(job_id)
+    for job_id in expired:
+        logger.info("JOB CLEANUP: Removed expired job ID=%s", job_id)
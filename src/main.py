@@ -1,14 +1,38 @@
-from fastapi import FastAPI, BackgroundTasks
+from fastapi import FastAPI, HTTPException, Request, Response
+from fastapi.concurrency import run_in_threadpool
+from fastapi.encoders import jsonable_encoder
 from pydantic import BaseModel
-import os
+from typing import List
+from contextlib import asynccontextmanager
+import hashlib
+import json
 import logging
-from datetime import datetime
+import os
+import re
+import secrets
+import shutil
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
 
-from src.s3 import download_file, upload_file
-from src.transcription import transcribe_audio
-from src.jobs import create_job, get_job_status, update_job_status
+from src.s3 import bucket_exists, copy_file, download_fileobj, get_etag, upload_bytes
+from src.transcription import load_audio, load_model, model_fingerprint, transcribe_audio
+from src.jobs import create_job, create_jobs, get_job_status, update_job_status, wait_for_job_update
 from src.notifications import send_webhook_notification, send_consul_notification
-from src.config import ROOT_PATH
+from src.config import (
+    LOG_LEVEL, PREFETCH_JOBS, RESULT_CACHE_S3_PATH, ROOT_PATH, SPOOL_DIR, TRANSCRIBE_WORKERS,
+)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Load the model before accepting traffic, so each uvicorn worker is warm
+    # and the first job doesn't pay for it. Loading happens in the worker
+    # process itself, which keeps CUDA initialization out of the parent
+    check_spool_dir()
+    await run_in_threadpool(load_model)
+    yield
 
 # Configure the FastAPI app with proper path prefix for documentation
 # Set the root path to handle load balancer prefixes
@@ -17,12 +41,12 @@ app = FastAPI(
     description="A service for transcribing video/audio files using Whisper ASR models.",
     version="1.0.0",
     root_path=ROOT_PATH,
+    lifespan=lifespan,
 )
 
 # Setup logging with custom formatting
-log_level = os.getenv("LOG_LEVEL", "INFO").upper()
 logging.basicConfig(
-    level=getattr(logging, log_level),
+    level=getattr(logging, LOG_LEVEL),
     format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
 )
 logger = logging.getLogger(__name__)
@@ -32,18 +56,85 @@ logging.getLogger("botocore").setLevel(logging.WARNING)
 logging.getLogger("boto3").setLevel(logging.WARNING)
 logging.getLogger("urllib3").setLevel(logging.WARNING)
 
+# Inputs up to this size are buffered in memory instead of in SPOOL_DIR
+SPOOL_MAX_SIZE = 64 * 1024 * 1024
+
+spool_dir = SPOOL_DIR or tempfile.gettempdir()
+
+def check_spool_dir():
+    """
+    Creates SPOOL_DIR if needed and logs its free space, failing startup
+    with a clear message when it can't be used.
+    """
+    try:
+        os.makedirs(spool_dir, exist_ok=True)
+        free = shutil.disk_usage(spool_dir).free
+    except OSError as e:
+        raise RuntimeError(f"SPOOL_DIR {spool_dir!r} is not usable: {e}") from e
+    logger.info(f"Spooling large inputs to {spool_dir} ({free // (1024 * 1024)} MiB free)")
+
+# Longest a /status request may be held open waiting for a change, in seconds
+STATUS_MAX_WAIT = 60
+
+# Runs work that can overlap with a job's S3 download (e.g. loading the model)
+executor = ThreadPoolExecutor(max_workers=2)
+
+# Delivers webhooks, so a slow or failing receiver (and its retries) holds
+# up neither the job thread nor the next queued job
+notify_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="notify")
+
+# Job queue: transcriptions run on their own bounded pool instead of as
+# request background tasks, so they don't compete with request handling for
+# the server's threadpool. The pool is PREFETCH_JOBS larger than the number
+# of inference slots, so while jobs transcribe, the next ones download their
+# input and finished ones upload their result
+job_executor = ThreadPoolExecutor(max_workers=TRANSCRIBE_WORKERS + PREFETCH_JOBS, thread_name_prefix="transcribe")
+inference_slots = threading.BoundedSemaphore(TRANSCRIBE_WORKERS)
+
+# s3://bucket/key - bucket has no slashes or whitespace, key is non-empty and
+# single-line (matched with fullmatch, so a trailing newline is rejected)
+_S3_URI = re.compile(r"s3://([^/\s]+)/(.+)")
+
+def parse_s3_uri(s3_uri):
+    """Parse S3 URI into bucket and key."""
+    match = _S3_URI.fullmatch(s3_uri)
+    if not match:
+        raise ValueError(f"Invalid S3 URI: {s3_uri}. Must be formatted as s3://bucket/key")
+    return match.group(1), match.group(2)
+
+# Result cache location: bucket and key prefix (empty bucket disables it)
+result_cache_bucket, _, result_cache_prefix = RESULT_CACHE_S3_PATH.removeprefix("s3://").partition("/")
+if result_cache_prefix and not result_cache_prefix.endswith("/"):
+    result_cache_prefix += "/"
+
 class TranscriptionRequest(BaseModel):
     input_s3_path: str
     output_s3_path: str
     webhook_url: str = None
     consul_notification: bool = False
 
-def process_transcription(job_id: str, input_s3_path: str, output_s3_path: str, webhook_url: str = None, consul_notification: bool = False):
+class BatchTranscriptionRequest(BaseModel):
+    jobs: List[TranscriptionRequest]
+
+# Consul keys that completion notifications are written under
+CONSUL_KEY_PREFIX = "services/video-transcription/"
+
+def consul_key_for(job_id: str, batch_id: str = None) -> str:
+    """
+    Returns the Consul key for a job's completion notification. Jobs of a
+    batch share a batches/<batch_id>/ subprefix, so a client can watch just
+    its own jobs with one recursive query.
+    """
+    if batch_id:
+        return f"{CONSUL_KEY_PREFIX}batches/{batch_id}/{job_id}"
+    return f"{CONSUL_KEY_PREFIX}{job_id}"
+
+def process_transcription(job_id: str, input_s3_path: str, output_s3_path: str, webhook_url: str = None, consul_notification: bool = False, consul_key: str = None):
     """
     Downloads the audio file, transcribes it, and uploads the result.
     """
     # Log request details
-    start_time = datetime.now()
+    start_time = time.perf_counter()
     logger.info(f"REQUEST: Job ID={job_id}, Input={input_s3_path}, Output={output_s3_path}")
     
     # Log webhook and consul information
@@ -51,32 +142,31 @@ def process_transcription(job_id: str, input_s3_path: str, output_s3_path: str,
         logger.info(f"WEBHOOK: Job ID={job_id}, Webhook URL={webhook_url}")
     if consul_notification:
         # Generate the standardized key for Consul notification
-        standardized_key = f"services/video-transcription/{job_id}"
+        standardized_key = consul_key or consul_key_for(job_id)
         logger.info(f"CONSOLE: Job ID={job_id}, Consul Notification Enabled Key={standardized_key}")
-    
-    # Properly parse S3 URIs to extract bucket and key
-    def parse_s3_uri(s3_uri):
-        """Parse S3 URI into bucket and key."""
-        if not s3_uri.startswith("s3://"):
-            raise ValueError(f"Invalid S3 URI: {s3_uri}. Must start with 's3://'")
-        
-        # Remove s3:// prefix
-        s3_path = s3_uri[5:]
-        
-        # Split into bucket and key
-        # Handle cases where there might be multiple slashes
-        parts = s3_path.split("/", 1)
-        if len(parts) != 2:
-            raise ValueError(f"Invalid S3 URI format: {s3_uri}")
-        
-        bucket = parts[0]
-        key = parts[1]
+
+    def fail(error):
+        """Mark the job failed and publish the terminal state to subscribers."""
+        update_job_status(job_id, "failed", {"error": error})
+        if webhook_url:
+            notify_executor.submit(send_webhook_notification, webhook_url, {"job_id": job_id, "status": "failed", "error": error})
+        if consul_notification:
+            send_consul_notification(standardized_key, "failed")
+
+    def complete():
+        """Mark the job completed, notify subscribers, and log its duration."""
+        update_job_status(job_id, "completed", {"output_s3_path": output_s3_path})
+        logger.info(f"STATUS: Job {job_id} completed successfully")
+
+        if webhook_url:
+            notify_executor.submit(send_webhook_notification, webhook_url, {"job_id": job_id, "status": "completed", "output_s3_path": output_s3_path})
         
-        # Validate bucket name
-        if not bucket or bucket.strip() == "":
-            raise ValueError(f"Invalid bucket name in S3 URI: {s3_uri}")
+        # Send Consul notification if enabled
+        if consul_notification:
+            send_consul_notification(standardized_key, "completed")
         
-        return bucket, key
+        # Log duration
+        logger.info("DURATION: Job %s took %.2f seconds", job_id, time.perf_counter() - start_time)
     
     try:
         # Parse S3 URIs
@@ -84,79 +174,83 @@ def process_transcription(job_id: str, input_s3_path: str, output_s3_path: str,
         output_bucket_name, output_object_name = parse_s3_uri(output_s3_path)
     except ValueError as e:
         logger.error(f"Failed to parse S3 URIs: {e}")
-        update_job_status(job_id, "failed", {"error": f"Failed to parse S3 URIs: {str(e)}"})
+        fail(f"Failed to parse S3 URIs: {str(e)}")
         return
     
     # Log S3 file being processed
-    if log_level == "DEBUG":
-        logger.debug(f"DEBUG: Processing S3 file - Bucket: {input_bucket_name}, Object: {input_object_name}")
-    
-    local_audio_path = f"/tmp/{os.path.basename(input_object_name)}"
-    local_transcription_path = f"/tmp/{os.path.basename(output_object_name)}"
+    logger.debug("DEBUG: Processing S3 file - Bucket: %s, Object: %s", input_bucket_name, input_object_name)
     
+    # Check both buckets in parallel before paying for the download, so a bad
+    # output location fails in one round trip instead of after the transfer
+    buckets = list(dict.fromkeys([input_bucket_name, output_bucket_name]))
+    missing = [bucket for bucket, ok in zip(buckets, executor.map(bucket_exists, buckets)) if not ok]
+    if missing:
+        logger.error(f"ERROR: Missing S3 bucket(s) for job {job_id}: {', '.join(missing)}")
+        fail(f"S3 bucket not found: {', '.join(missing)}")
+        return
+
     try:
-        # Download audio file
-        if not download_file(input_bucket_name, input_object_name, local_audio_path):
-            update_job_status(job_id, "failed", {"error": "Failed to download audio file."})
-            logger.error(f"ERROR: Failed to download audio file for job {job_id}")
-            return
+        # An input transcribed before (same ETag) is served by copying the
+        # cached transcript server-side instead of running the model again
+        cache_key = None
+        if result_cache_bucket:
+            input_etag = get_etag(input_bucket_name, input_object_name)
+            if input_etag:
+                cache_key = f"{result_cache_prefix}{model_fingerprint()}/{input_etag}.txt"
+                if get_etag(result_cache_bucket, cache_key) and copy_file(result_cache_bucket, cache_key, output_bucket_name, output_object_name):
+                    logger.info(f"CACHE: Job {job_id} reused cached transcript {cache_key}")
+                    complete()
+                    return
 
-        # Log input when in debug mode
-        if log_level == "DEBUG":
-            logger.debug(f"DEBUG: Audio file downloaded - Local path: {local_audio_path}")
-        
-        # Transcribe audio
-        transcription_result = transcribe_audio(local_audio_path)
+        # Load the model while the audio downloads; the two are independent
+        model_future = executor.submit(load_model)
+
+        # Small inputs stay in memory; larger ones spill to a temporary file
+        with tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_SIZE, dir=spool_dir) as audio:
+            # Download audio file
+            if not download_fileobj(input_bucket_name, input_object_name, audio):
+                fail("Failed to download audio file.")
+                logger.error(f"ERROR: Failed to download audio file for job {job_id}")
+                return
+
+            # Log input when in debug mode
+            logger.debug("DEBUG: Audio file downloaded - Size: %d bytes", audio.tell())
+
+            # Decode to 16 kHz mono samples before taking an inference slot,
+            # so the next job's decoding overlaps the current job's inference;
+            # the downloaded file is released as soon as it is decoded
+            audio.seek(0)
+            samples = load_audio(audio)
+
+        # Transcribe audio; only TRANSCRIBE_WORKERS jobs run inference at once
+        with inference_slots:
+            transcription_result = transcribe_audio(samples, model=model_future.result())
+        del samples
         
         # Log output when in debug mode
-        if log_level == "DEBUG":
-            logger.debug(f"DEBUG: Transcription result length: {len(transcription_result)} characters")
-        
-        # Write transcription to local file
-        with open(local_transcription_path, "w") as f:
-            f.write(transcription_result)
+        logger.debug("DEBUG: Transcription result length: %d characters", len(transcription_result))
 
-        # Upload transcription
-        if not upload_file(local_transcription_path, output_bucket_name, output_object_name):
-            update_job_status(job_id, "failed", {"error": "Failed to upload transcription."})
+        # Upload transcription straight from memory in a single PUT
+        transcript = transcription_result.encode("utf-8")
+        if not upload_bytes(transcript, output_bucket_name, output_object_name):
+            fail("Failed to upload transcription.")
             logger.error(f"ERROR: Failed to upload transcription for job {job_id}")
             return
 
-        update_job_status(job_id, "completed", {"output_s3_path": output_s3_path})
-        logger.info(f"STATUS: Job {job_id} completed successfully")
+        # Caching is best effort; the job has already succeeded
+        if cache_key and not upload_bytes(transcript, result_cache_bucket, cache_key, max_retries=1):
+            logger.warning(f"WARNING: Failed to cache transcript for job {job_id}")
 
-        if webhook_url:
-            send_webhook_notification(webhook_url, {"job_id": job_id, "status": "completed", "output_s3_path": output_s3_path})
-        
-        # Send Consul notification if enabled
-        if consul_notification:
-            standardized_key = f"services/video-transcription/{job_id}"
-            send_consul_notification(standardized_key, "completed")
-
-        # Clean up temporary files
-        os.remove(local_audio_path)
-        os.remove(local_transcription_path)
-        
-        # Log duration
-        duration = datetime.now() - start_time
-        logger.info(f"DURATION: Job {job_id} took {duration.total_seconds():.2f} seconds")
+        complete()
     except Exception as e:
         # Handle any exceptions during the transcription process
-        update_job_status(job_id, "failed", {"error": f"Job failed: {str(e)}"})
+        fail(f"Job failed: {str(e)}")
         logger.error(f"ERROR: Job failed for job {job_id}: {str(e)}")
-        # Clean up temporary files if they exist
-        try:
-            if os.path.exists(local_audio_path):
-                os.remove(local_audio_path)
-            if os.path.exists(local_transcription_path):
-                os.remove(local_transcription_path)
-        except:
-            pass
 
 @app.post("/transcribe")
-async def transcribe(request: TranscriptionRequest, background_tasks: BackgroundTasks):
-    job_id = create_job()
-    background_tasks.add_task(
+async def transcribe(request: TranscriptionRequest):
+    job_id = await run_in_threadpool(create_job)
+    job_executor.submit(
         process_transcription,
         job_id,
         request.input_s3_path,
@@ -165,12 +259,68 @@ async def transcribe(request: TranscriptionRequest, background_tasks: Background
         request.consul_notification,
     )
     # Return the standardized consul key for the client
-    consul_key = f"services/video-transcription/{job_id}" if request.consul_notification else None
+    consul_key = consul_key_for(job_id) if request.consul_notification else None
     return {"job_id": job_id, "consul_key": consul_key}
 
-@app.get("/status/{job_id}")
-async def status(job_id: str):
-    return get_job_status(job_id)
+@app.post("/transcribe/batch")
+async def transcribe_batch(request: BatchTranscriptionRequest):
+    # Register every job in one store call, then queue them in request order
+    job_ids = await run_in_threadpool(create_jobs, len(request.jobs))
+    batch_id = secrets.token_hex(8)
+    response = []
+    for job_id, job in zip(job_ids, request.jobs):
+        consul_key = consul_key_for(job_id, batch_id) if job.consul_notification else None
+        job_executor.submit(
+            process_transcription,
+            job_id,
+            job.input_s3_path,
+            job.output_s3_path,
+            job.webhook_url,
+            job.consul_notification,
+            consul_key,
+        )
+        response.append({"job_id": job_id, "consul_key": consul_key})
+    return {"jobs": response}
+
+def _status_body(job):
+    """Return the serialized JSON status body for a job and its ETag."""
+    created_at = job.get("created_at")
+    if isinstance(created_at, (int, float)):
+        # Stored as epoch seconds; the API has always reported a naive UTC
+        # ISO-8601 timestamp
+        job = {**job, "created_at": datetime.fromtimestamp(created_at, timezone.utc).replace(tzinfo=None).isoformat()}
+    # Serialized once, deterministically; the ETag hashes the bytes sent
+    body = json.dumps(jsonable_encoder(job), sort_keys=True, separators=(",", ":")).encode("utf-8")
+    etag = '"' + hashlib.sha1(body).hexdigest() + '"'
+    return body, etag
+
+@app.api_route("/status/{job_id}", methods=["GET", "HEAD"])
+async def status(job_id: str, request: Request, wait: float = 0):
+    # Tag the status with a content hash so pollers can revalidate with
+    # If-None-Match and get an empty 304 while the job is unchanged.
+    # With ?wait=<seconds>, a revalidation is held open until the job
+    # changes or the wait elapses (long polling) instead of answering at once.
+    # X-Job-Status carries the bare status, so HEAD requests and pollers can
+    # check it without transferring or parsing the body
+    # Store calls may block on Redis, so they run off the event loop
+    job = await run_in_threadpool(get_job_status, job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    body, etag = _status_body(job)
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match == etag and wait > 0:
+        if await wait_for_job_update(job_id, job["status"], min(wait, STATUS_MAX_WAIT)):
+            # The job may also have expired while we waited
+            job = await run_in_threadpool(get_job_status, job_id)
+            if job is None:
+                raise HTTPException(status_code=404, detail="Job not found")
+            body, etag = _status_body(job)
+    headers = {"ETag": etag, "X-Job-Status": job["status"]}
+    if if_none_match == etag:
+        return Response(status_code=304, headers=headers)
+    if request.method == "HEAD":
+        return Response(status_code=200, headers=headers)
+    return Response(body, media_type="application/json", headers=headers)
 
 @app.get("/health")
 def health_check():
@@ -1,28 +1,56 @@
+import json
+import time
 import requests
 import consul
 import logging
+from requests.adapters import HTTPAdapter
 
 from src.config import CONSUL_HOST, CONSUL_PORT
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-def send_webhook_notification(url, data):
-    """Sends a POST request to the specified webhook URL."""
-    try:
-        response = requests.post(url, json=data)
-        response.raise_for_status()
-        logger.info(f"Webhook notification sent to {url}.")
-        return True
-    except requests.exceptions.RequestException as e:
-        logger.error(f"Failed to send webhook notification: {e}")
-        return False
+# Shared session so repeated webhooks to the same host reuse keep-alive
+# connections. The adapter itself never retries; send_webhook_notification
+# is the single retry policy
+_SESSION = requests.Session()
+_ADAPTER = HTTPAdapter(pool_connections=16, pool_maxsize=16, max_retries=0)
+_SESSION.mount("http://", _ADAPTER)
+_SESSION.mount("https://", _ADAPTER)
+
+# (connect, read) timeouts for webhook requests, in seconds
+WEBHOOK_TIMEOUT = (3.05, 10)
+JSON_HEADERS = {"Content-Type": "application/json"}
+
+# One Consul client per process; it keeps its HTTP connection alive between
+# notifications (creating it doesn't connect, so this is safe at import)
+_CONSUL = consul.Consul(host=CONSUL_HOST, port=CONSUL_PORT)
+
+def send_webhook_notification(url, data, max_retries=3):
+    """
+    Sends a POST request to the specified webhook URL with retry logic.
+    Connection errors, timeouts and 5xx responses are retried; a 4xx
+    response is final, since re-sending the same body won't change it.
+    """
+    body = json.dumps(data, separators=(",", ":")).encode("utf-8")
+    for attempt in range(max_retries):
+        try:
+            response = _SESSION.post(url, data=body, headers=JSON_HEADERS, timeout=WEBHOOK_TIMEOUT)
+            response.raise_for_status()
+            logger.info(f"Webhook notification sent to {url}.")
+            return True
+        except requests.exceptions.RequestException as e:
+            logger.error(f"Failed to send webhook notification (attempt {attempt + 1}): {e}")
+            if e.response is not None and e.response.status_code < 500:
+                return False  # 4xx: the receiver rejected it, retrying won't help
+            if attempt < max_retries - 1:  # Don't sleep on the last attempt
+                time.sleep(2 ** attempt)  # Exponential backoff
+    return False
 
 def send_consul_notification(key, value):
     """Sends a notification to Consul by updating a key-value pair."""
     try:
-        c = consul.Consul(host=CONSUL_HOST, port=CONSUL_PORT)
-        c.kv.put(key, value)
+        _CONSUL.kv.put(key, value)
         logger.info(f"Consul notification sent for key {key}.")
         return True
     except consul.ConsulException as e:
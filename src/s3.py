@@ -1,15 +1,19 @@
 import boto3
+from boto3.s3.transfer import TransferConfig
+from botocore.config import Config
 from botocore.exceptions import NoCredentialsError, PartialCredentialsError, ClientError
 import logging
 import os
+import threading
 import time
 
-from src.config import AWS_ACCESS_KEY_ID, AWS_SECRET_ACCESS_KEY, AWS_REGION
+from src.config import (
+    AWS_ACCESS_KEY_ID, AWS_SECRET_ACCESS_KEY, AWS_REGION, LOG_LEVEL, S3_ENDPOINT, S3_MAX_CONCURRENCY,
+)
 
 # Setup logging with custom formatting
-log_level = os.getenv("LOG_LEVEL", "INFO").upper()
 logging.basicConfig(
-    level=getattr(logging, log_level),
+    level=getattr(logging, LOG_LEVEL),
     format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
 )
 logger = logging.getLogger(__name__)
@@ -19,35 +23,117 @@ logging.getLogger("botocore").setLevel(logging.WARNING)
 logging.getLogger("boto3").setLevel(logging.WARNING)
 logging.getLogger("urllib3").setLevel(logging.WARNING)
 
+# Multipart transfer settings: split large objects into 16 MiB parts moved by
+# parallel threads, and read/write in 1 MiB chunks instead of the 256 KiB default
+TRANSFER_CONFIG = TransferConfig(
+    multipart_threshold=8 * 1024 * 1024,
+    multipart_chunksize=16 * 1024 * 1024,
+    max_concurrency=S3_MAX_CONCURRENCY,
+    io_chunksize=1024 * 1024,
+    use_threads=True,
+)
+
+# Server-side copies move larger 64 MiB ranges, since no bytes pass through the client
+COPY_TRANSFER_CONFIG = TransferConfig(
+    multipart_threshold=8 * 1024 * 1024,
+    multipart_chunksize=64 * 1024 * 1024,
+    max_concurrency=S3_MAX_CONCURRENCY,
+)
+
+# Client settings: a connection pool large enough for concurrent multipart
+# transfers (two at full concurrency, plus headroom) and TCP keep-alive on
+# idle pooled connections. Retries stay at botocore's standard 3 attempts per
+# request; the transfer helpers below add the outer retry loop with backoff
+CLIENT_CONFIG = Config(
+    max_pool_connections=max(32, 2 * S3_MAX_CONCURRENCY + 4),
+    retries={"mode": "standard"},
+    tcp_keepalive=True,
+)
+
+# Clients by endpoint URL, built once under the lock
+_S3_CLIENTS = {}
+_S3_CLIENTS_LOCK = threading.Lock()
+
 def get_s3_client(endpoint_url=None):
-    """Initializes and returns a boto3 S3 client."""
-    try:
-        # Use the provided endpoint URL or fall back to default S3
-        if endpoint_url is None:
-            endpoint_url = os.getenv("S3_ENDPOINT")
-        
-        s3_client = boto3.client(
-            "s3",
-            aws_access_key_id=AWS_ACCESS_KEY_ID,
-            aws_secret_access_key=AWS_SECRET_ACCESS_KEY,
-            region_name=AWS_REGION,
-            endpoint_url=endpoint_url,
-        )
+    """
+    Initializes and returns a boto3 S3 client.
+
+    Clients are thread-safe and expensive to build, so one client per
+    endpoint is created and reused for the life of the process. The lock
+    keeps concurrent first callers (e.g. parallel bucket checks) from
+    each building their own.
+    """
+    # Use the provided endpoint URL or fall back to default S3
+    if endpoint_url is None:
+        endpoint_url = S3_ENDPOINT
+
+    s3_client = _S3_CLIENTS.get(endpoint_url)
+    if s3_client is not None:
         return s3_client
-    except (NoCredentialsError, PartialCredentialsError):
-        logger.error("AWS credentials not found.")
-        return None
 
-def download_file(bucket_name, object_name, file_name, max_retries=3):
+    with _S3_CLIENTS_LOCK:
+        if endpoint_url not in _S3_CLIENTS:
+            try:
+                _S3_CLIENTS[endpoint_url] = boto3.client(
+                    "s3",
+                    aws_access_key_id=AWS_ACCESS_KEY_ID,
+                    aws_secret_access_key=AWS_SECRET_ACCESS_KEY,
+                    region_name=AWS_REGION,
+                    endpoint_url=endpoint_url,
+                    config=CLIENT_CONFIG,
+                )
+            except (NoCredentialsError, PartialCredentialsError):
+                logger.error("AWS credentials not found.")
+                return None
+        return _S3_CLIENTS[endpoint_url]
+
+def bucket_exists(bucket_name):
+    """
+    Checks with a HEAD request that a bucket exists. Only a missing bucket
+    is reported as False: HEAD needs s3:ListBucket, which credentials
+    limited to object reads and writes don't have, so any other error
+    leaves the decision to the transfer itself.
+    """
+    s3_client = get_s3_client()
+    if s3_client:
+        try:
+            s3_client.head_bucket(Bucket=bucket_name)
+            return True
+        except ClientError as e:
+            if e.response.get("Error", {}).get("Code") in ("404", "NoSuchBucket"):
+                logger.error(f"Bucket {bucket_name} does not exist: {e}")
+                return False
+            logger.warning(f"Could not check bucket {bucket_name}, continuing: {e}")
+            return True
+        except Exception as e:
+            # Not a definitive answer; let the transfer and its retries decide
+            logger.warning(f"Unexpected error checking bucket {bucket_name}: {e}")
+            return True
+    return False
+
+def get_etag(bucket_name, object_name):
+    """Returns an object's ETag from a HEAD request, or None if it doesn't exist or can't be read."""
+    s3_client = get_s3_client()
+    if s3_client:
+        try:
+            return s3_client.head_object(Bucket=bucket_name, Key=object_name)["ETag"].strip('"')
+        except ClientError as e:
+            if e.response.get("Error", {}).get("Code") not in ("404", "NoSuchKey"):
+                logger.warning(f"Failed to read ETag of {object_name} in bucket {bucket_name}: {e}")
+        except Exception as e:
+            logger.warning(f"Unexpected error reading ETag of {object_name} in bucket {bucket_name}: {e}")
+    return None
+
+def download_file(bucket_name, object_name, file_name, max_retries=3, config=TRANSFER_CONFIG):
     """Downloads a file from an S3 bucket with retry logic."""
     s3_client = get_s3_client()
     if s3_client:
         for attempt in range(max_retries):
             try:
-                s3_client.download_file(bucket_name, object_name, file_name)
+                s3_client.download_file(bucket_name, object_name, file_name, Config=config)
                 logger.info(f"File {object_name} downloaded from bucket {bucket_name} to {file_name}.")
-                if log_level == "DEBUG":
-                    logger.debug(f"DEBUG: Downloaded file size: {os.path.getsize(file_name)} bytes")
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug("DEBUG: Downloaded file size: %d bytes", os.path.getsize(file_name))
                 return True
             except ClientError as e:
                 logger.error(f"Failed to download file (attempt {attempt + 1}): {e}")
@@ -63,7 +149,7 @@ def download_file(bucket_name, object_name, file_name, max_retries=3):
                     return False
     return False
 
-def upload_file(file_name, bucket_name, object_name=None, max_retries=3):
+def upload_file(file_name, bucket_name, object_name=None, max_retries=3, config=TRANSFER_CONFIG):
     """Uploads a file to an S3 bucket with retry logic."""
     if object_name is None:
         object_name = file_name
@@ -72,10 +158,60 @@ def upload_file(file_name, bucket_name, object_name=None, max_retries=3):
     if s3_client:
         for attempt in range(max_retries):
             try:
-                s3_client.upload_file(file_name, bucket_name, object_name)
+                s3_client.upload_file(file_name, bucket_name, object_name, Config=config)
                 logger.info(f"File {file_name} uploaded to bucket {bucket_name} as {object_name}.")
-                if log_level == "DEBUG":
-                    logger.debug(f"DEBUG: Uploaded file size: {os.path.getsize(file_name)} bytes")
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug("DEBUG: Uploaded file size: %d bytes", os.path.getsize(file_name))
+                return True
+            except ClientError as e:
+                logger.error(f"Failed to upload file (attempt {attempt + 1}): {e}")
+                if attempt < max_retries - 1:  # Don't sleep on the last attempt
+                    time.sleep(2 ** attempt)  # Exponential backoff
+                else:
+                    return False
+            except Exception as e:
+                logger.error(f"Unexpected error uploading file (attempt {attempt + 1}): {e}")
+                if attempt < max_retries - 1:  # Don't sleep on the last attempt
+                    time.sleep(2 ** attempt)  # Exponential backoff
+                else:
+                    return False
+    return False
+
+def download_fileobj(bucket_name, object_name, fileobj, max_retries=3, config=TRANSFER_CONFIG):
+    """Downloads an S3 object into a writable binary file object with retry logic."""
+    s3_client = get_s3_client()
+    if s3_client:
+        for attempt in range(max_retries):
+            try:
+                # Discard any partial data from a previous attempt
+                fileobj.seek(0)
+                fileobj.truncate()
+                s3_client.download_fileobj(bucket_name, object_name, fileobj, Config=config)
+                logger.info(f"File {object_name} downloaded from bucket {bucket_name}.")
+                logger.debug("DEBUG: Downloaded file size: %d bytes", fileobj.tell())
+                return True
+            except ClientError as e:
+                logger.error(f"Failed to download file (attempt {attempt + 1}): {e}")
+                if attempt < max_retries - 1:  # Don't sleep on the last attempt
+                    time.sleep(2 ** attempt)  # Exponential backoff
+                else:
+                    return False
+            except Exception as e:
+                logger.error(f"Unexpected error downloading file (attempt {attempt + 1}): {e}")
+                if attempt < max_retries - 1:  # Don't sleep on the last attempt
+                    time.sleep(2 ** attempt)  # Exponential backoff
+                else:
+                    return False
+    return False
+
+def upload_bytes(body, bucket_name, object_name, max_retries=3):
+    """Uploads an in-memory payload to an S3 bucket with a single PUT and retry logic."""
+    s3_client = get_s3_client()
+    if s3_client:
+        for attempt in range(max_retries):
+            try:
+                s3_client.put_object(Bucket=bucket_name, Key=object_name, Body=body)
+                logger.info(f"Uploaded {len(body)} bytes to bucket {bucket_name} as {object_name}.")
                 return True
             except ClientError as e:
                 logger.error(f"Failed to upload file (attempt {attempt + 1}): {e}")
@@ -90,3 +226,26 @@ def upload_file(file_name, bucket_name, object_name=None, max_retries=3):
                 else:
                     return False
     return False
+
+def copy_file(source_bucket, source_key, bucket_name, object_name, max_retries=3, config=COPY_TRANSFER_CONFIG):
+    """Copies an S3 object server-side (multipart UploadPartCopy for large objects) with retry logic."""
+    s3_client = get_s3_client()
+    if s3_client:
+        for attempt in range(max_retries):
+            try:
+                s3_client.copy({"Bucket": source_bucket, "Key": source_key}, bucket_name, object_name, Config=config)
+                logger.info(f"File {source_key} in bucket {source_bucket} copied to bucket {bucket_name} as {object_name}.")
+                return True
+            except ClientError as e:
+                logger.error(f"Failed to copy file (attempt {attempt + 1}): {e}")
+                if attempt < max_retries - 1:  # Don't sleep on the last attempt
+                    time.sleep(2 ** attempt)  # Exponential backoff
+                else:
+                    return False
+            except Exception as e:
+                logger.error(f"Unexpected error copying file (attempt {attempt + 1}): {e}")
+                if attempt < max_retries - 1:  # Don't sleep on the last attempt
+                    time.sleep(2 ** attempt)  # Exponential backoff
+                else:
+                    return False
+    return False
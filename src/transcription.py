@@ -1,11 +1,35 @@
+import io
 import os
+import re
+import functools
 import logging
-from faster_whisper import WhisperModel
+import threading
+from typing import BinaryIO, Union
+
+from src.config import (
+    LOG_LEVEL, TRANSCRIBE_WORKERS, WEB_CONCURRENCY, WHISPER_BATCH_SIZE, WHISPER_COMPUTE_TYPE,
+    WHISPER_CPU_THREADS, WHISPER_DEVICE, WHISPER_MODEL, WHISPER_VAD_FILTER, WHISPER_VAD_MIN_SILENCE_MS,
+)
+
+# Give each concurrent transcription its share of the CPUs this process may
+# use, so worker processes and jobs don't oversubscribe the cores. OpenMP
+# reads its thread count when the library loads, hence before the imports.
+# sched_getaffinity is Linux-only; elsewhere fall back to all CPUs
+_AVAILABLE_CPUS = len(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else (os.cpu_count() or 1)
+CPU_THREADS = WHISPER_CPU_THREADS or max(
+    1, _AVAILABLE_CPUS // (WEB_CONCURRENCY * TRANSCRIBE_WORKERS)
+)
+os.environ.setdefault("OMP_NUM_THREADS", str(CPU_THREADS))
+os.environ.setdefault("MKL_NUM_THREADS", str(CPU_THREADS))
+
+import ctranslate2
+import numpy as np
+from faster_whisper import BatchedInferencePipeline, WhisperModel, decode_audio
+from faster_whisper.utils import download_model
 
 # Setup logging with custom formatting
-log_level = os.getenv("LOG_LEVEL", "INFO").upper()
 logging.basicConfig(
-    level=getattr(logging, log_level),
+    level=getattr(logging, LOG_LEVEL),
     format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
 )
 logger = logging.getLogger(__name__)
@@ -13,41 +37,179 @@ logger = logging.getLogger(__name__)
 # Configure specific loggers to avoid excessive logs
 logging.getLogger("faster_whisper").setLevel(logging.WARNING)
 
-def transcribe_audio(audio_path: str) -> str:
+# Silent stretches are dropped before the encoder; timestamps still refer
+# to the original audio
+VAD_OPTIONS = {
+    "vad_filter": WHISPER_VAD_FILTER,
+    "vad_parameters": {"min_silence_duration_ms": WHISPER_VAD_MIN_SILENCE_MS},
+}
+
+# Models are loaded once per process and shared by every job; the lock keeps
+# concurrent first callers from loading the same weights twice
+_MODEL_LOCK = threading.Lock()
+
+def load_model() -> WhisperModel:
+    """
+    Loads the configured Whisper model (WHISPER_MODEL, WHISPER_DEVICE,
+    WHISPER_COMPUTE_TYPE), or returns the already-loaded one.
+
+    Returns:
+        WhisperModel: The loaded model.
     """
-    Transcribes the audio from a given path into raw text.
+    device = _device()
+    with _MODEL_LOCK:
+        return _get_model(WHISPER_MODEL, device, _compute_type(device))
+
+@functools.lru_cache(maxsize=4)
+def _get_model(size: str, device: str, compute_type: str) -> WhisperModel:
+    """Builds a model; cached so each configuration is loaded only once."""
+    logger.info(f"Loading Whisper model {size} on {device} ({compute_type})")
+    _prefetch_model_files(size)
+    # One CTranslate2 worker per concurrent job, so TRANSCRIBE_WORKERS jobs
+    # sharing this model actually run in parallel instead of queueing on it
+    return WhisperModel(
+        size, device=device, compute_type=compute_type, cpu_threads=CPU_THREADS,
+        num_workers=TRANSCRIBE_WORKERS,
+    )
+
+def _prefetch_model_files(size: str):
+    """
+    Asks the kernel to start reading an already-downloaded model's files
+    into the page cache, so loading doesn't wait on one sequential read
+    per file. Models not cached yet are downloaded by WhisperModel as usual.
+    This is only a hint: it's skipped where posix_fadvise doesn't exist
+    (macOS, Windows) and on any file it can't open.
+    """
+    if not hasattr(os, "posix_fadvise"):
+        return
+    try:
+        model_dir = size if os.path.isdir(size) else download_model(size, local_files_only=True)
+        entries = list(os.scandir(model_dir))
+    except Exception:
+        return
+    for entry in entries:
+        try:
+            if not entry.is_file():
+                continue
+            fd = os.open(entry.path, os.O_RDONLY)
+        except OSError:
+            continue
+        try:
+            os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_WILLNEED)
+        except OSError:
+            pass
+        finally:
+            os.close(fd)
+
+@functools.lru_cache(maxsize=4)
+def _get_pipeline(model: WhisperModel) -> BatchedInferencePipeline:
+    """Wraps a model for batched decoding; built once per model."""
+    return BatchedInferencePipeline(model=model)
+
+@functools.lru_cache(maxsize=None)
+def _batch_size() -> int:
+    """
+    Returns WHISPER_BATCH_SIZE, defaulting to 16 on CUDA and 0 (sequential)
+    on CPU. Always 0 with the VAD filter off: the batched pipeline splits
+    audio at the speech regions VAD finds and can't run without them.
+    """
+    if not WHISPER_VAD_FILTER:
+        if WHISPER_BATCH_SIZE and int(WHISPER_BATCH_SIZE) > 0:
+            logger.warning("WHISPER_BATCH_SIZE is ignored with WHISPER_VAD_FILTER off; decoding sequentially")
+        return 0
+    if WHISPER_BATCH_SIZE:
+        return int(WHISPER_BATCH_SIZE)
+    return 16 if _device() == "cuda" else 0
+
+@functools.lru_cache(maxsize=None)
+def _device() -> str:
+    """Returns WHISPER_DEVICE, resolving auto to cuda when a CUDA device is available."""
+    if WHISPER_DEVICE != "auto":
+        return WHISPER_DEVICE
+    return "cuda" if ctranslate2.get_cuda_device_count() > 0 else "cpu"
+
+def _compute_type(device: str) -> str:
+    """
+    Returns the compute type for the model: WHISPER_COMPUTE_TYPE if set,
+    otherwise float16 on CUDA and int8 on CPU.
+    """
+    if WHISPER_COMPUTE_TYPE:
+        return WHISPER_COMPUTE_TYPE
+    return "float16" if device == "cuda" else "int8"
+
+def model_fingerprint() -> str:
+    """
+    Returns a short, path-safe tag for the settings that shape a transcript
+    (model, compute type, VAD and batching), e.g. base-int8-vad500-b0.
+    Transcripts cached under one tag are never reused under another.
+    """
+    model = re.sub(r"[^A-Za-z0-9._-]+", "_", WHISPER_MODEL.strip("/"))
+    vad = f"vad{WHISPER_VAD_MIN_SILENCE_MS}" if WHISPER_VAD_FILTER else "novad"
+    return f"{model}-{_compute_type(_device())}-{vad}-b{_batch_size()}"
+
+# Sample rate the Whisper feature extractor expects
+SAMPLING_RATE = 16000
+
+def load_audio(audio: Union[str, BinaryIO]) -> np.ndarray:
+    """
+    Decodes and resamples audio to the 16 kHz mono float32 samples the
+    model consumes, so decoding can run apart from inference.
 
     Args:
-        audio_path (str): The path to the audio file.
+        audio (str or BinaryIO): The path to the audio file, or a readable binary file object.
+
+    Returns:
+        np.ndarray: The decoded samples.
+    """
+    return decode_audio(audio, sampling_rate=SAMPLING_RATE)
+
+def transcribe_audio(audio: Union[str, BinaryIO, np.ndarray], model: WhisperModel = None) -> str:
+    """
+    Transcribes the audio from a given path or file object into raw text.
+
+    Args:
+        audio (str, BinaryIO or np.ndarray): The path to the audio file, a readable binary
+            file object, or samples already decoded by load_audio().
+        model (WhisperModel, optional): A preloaded model. Loaded on demand if omitted.
 
     Returns:
         str: The transcribed text.
     """
-    if log_level == "DEBUG":
-        logger.debug(f"DEBUG: Starting transcription for file: {audio_path}")
-        logger.debug(f"DEBUG: File size: {os.path.getsize(audio_path)} bytes")
+    if isinstance(audio, str) and logger.isEnabledFor(logging.DEBUG):
+        logger.debug("DEBUG: Starting transcription for file: %s (%d bytes)", audio, os.path.getsize(audio))
     
-    model = WhisperModel("base")
-    segments, _ = model.transcribe(audio_path)
-    
-    aggregated_segments = []
-    current_segment = None
+    if model is None:
+        model = load_model()
+    # Consecutive segments with identical text are merged into one line;
+    # each line is written out as soon as the next distinct segment starts
+    out = io.StringIO()
+    separator = ""
+    current_start = current_end = current_text = None
+
+    # Batching feeds several windows through the encoder/decoder at
+    # once, which keeps a GPU busy; sequential decoding conditions each
+    # window on the previous text instead
+    batch_size = _batch_size()
+    if batch_size > 0:
+        segments, _ = _get_pipeline(model).transcribe(audio, batch_size=batch_size, **VAD_OPTIONS)
+    else:
+        segments, _ = model.transcribe(audio, **VAD_OPTIONS)
 
     for segment in segments:
-        if current_segment is None:
-            current_segment = {"start": segment.start, "end": segment.end, "text": segment.text}
-        elif segment.text == current_segment["text"]:
-            current_segment["end"] = segment.end
+        if current_text is None:
+            current_start, current_end, current_text = segment.start, segment.end, segment.text
+        elif segment.text == current_text:
+            current_end = segment.end
         else:
-            aggregated_segments.append(current_segment)
-            current_segment = {"start": segment.start, "end": segment.end, "text": segment.text}
+            out.write(f"{separator}{current_start:.2f}-{current_end:.2f}: {current_text}")
+            separator = "\n"
+            current_start, current_end, current_text = segment.start, segment.end, segment.text
 
-    if current_segment is not None:
-        aggregated_segments.append(current_segment)
+    if current_text is not None:
+        out.write(f"{separator}{current_start:.2f}-{current_end:.2f}: {current_text}")
 
-    result = "\n".join([f"{s['start']:.2f}-{s['end']:.2f}: {s['text']}" for s in aggregated_segments])
+    result = out.getvalue()
     
-    if log_level == "DEBUG":
-        logger.debug(f"DEBUG: Transcription completed. Result length: {len(result)} characters")
+    logger.debug("DEBUG: Transcription completed. Result length: %d characters", len(result))
     
     return result
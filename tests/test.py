@@ -12,6 +12,13 @@ import requests
 import time
 import sys
 from typing import Dict, Any
+from requests.adapters import HTTPAdapter
+
+# One session for the whole test, so the submission and every status poll
+# reuse a single keep-alive connection
+session = requests.Session()
+session.mount("http://", HTTPAdapter(pool_connections=1, pool_maxsize=4))
+session.mount("https://", HTTPAdapter(pool_connections=1, pool_maxsize=4))
 
 # Test data
 INPUT_FILE = 's3://ai-storage/transcriber/tests/test001.mp4'
@@ -40,7 +47,7 @@ def test_transcription_workflow():
     # Step 1: Submit transcription job
     print("Submitting transcription job...")
     try:
-        response = requests.post(
+        response = session.post(
             f"{BASE_URL}/transcribe",
             json={
                 "input_s3_path": INPUT_FILE,
@@ -61,20 +68,42 @@ def test_transcription_workflow():
         print(f"Error submitting transcription job: {e}")
         return False
 
-    # Step 2: Poll for job status updates
+    # Step 2: Poll for job status updates. Each poll revalidates with the
+    # last ETag and asks the server to hold the request (?wait) until the
+    # job changes, so a change is seen as soon as it happens. If a poll comes
+    # back unchanged without being held, back off from 0.2 s up to 2 s
     print("Polling for job status...")
-    max_polls = 30  # Maximum polls (30 * 2 seconds = 60 seconds max)
-    poll_interval = 2  # seconds between polls
+    timeout = 60  # seconds to wait for the job to finish
+    long_poll = 30  # seconds the server may hold each poll
+    deadline = time.monotonic() + timeout
+    etag = None
+    i = 0
     cursor = ["|", "/", "-", "\\"]
 
-    for i in range(max_polls):
+    while True:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            print("Timeout waiting for job completion")
+            return False
         try:
-            status_response = requests.get(f"{BASE_URL}/status/{job_id}")
+            headers = {"If-None-Match": etag} if etag else {}
+            params = {"wait": min(long_poll, remaining)} if etag else {}
+            started = time.monotonic()
+            status_response = session.get(f"{BASE_URL}/status/{job_id}", headers=headers,
+                                          params=params, timeout=long_poll + 5)
+
+            if status_response.status_code == 304:
+                # Unchanged; only back off if the server answered right away
+                if time.monotonic() - started < 1:
+                    time.sleep(min(2.0, 0.2 * 1.5 ** i))
+                i += 1
+                continue
 
             if status_response.status_code != 200:
                 print(f"Failed to get job status: {status_response.status_code}")
                 return False
 
+            etag = status_response.headers.get("ETag")
             status_data = status_response.json()
             status = status_data.get('status', '')
 
@@ -106,11 +135,10 @@ def test_transcription_workflow():
             print(f"Error polling for job status: {e}")
             return False
 
-        # Wait before next poll
-        time.sleep(poll_interval)
-    else:
-        print("Timeout waiting for job completion")
-        return False
+        # Without an ETag to revalidate against, fall back to backoff polling
+        if not etag:
+            time.sleep(min(2.0, 0.2 * 1.5 ** i))
+        i += 1
 
     # Step 3: Check that output was created
     print("Checking output file creation...")
@@ -0,0 +1,39 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the S3 bucket check; the S3 client is mocked, so no
+credentials or network are needed.
+"""
+
+import unittest
+from unittest import mock
+
+from botocore.exceptions import ClientError
+
+from src import s3
+
+
+def _client_error(code):
+    return ClientError({"Error": {"Code": code, "Message": code}}, "HeadBucket")
+
+
+class BucketExistsTest(unittest.TestCase):
+    def _check(self, head_bucket):
+        client = mock.Mock()
+        client.head_bucket.side_effect = head_bucket
+        with mock.patch.object(s3, "get_s3_client", return_value=client):
+            return s3.bucket_exists("bucket")
+
+    def test_existing_bucket(self):
+        self.assertTrue(self._check(None))
+
+    def test_missing_bucket(self):
+        self.assertFalse(self._check(_client_error("404")))
+        self.assertFalse(self._check(_client_error("NoSuchBucket")))
+
+    def test_forbidden_leaves_it_to_the_transfer(self):
+        # Credentials with only s3:GetObject/s3:PutObject get a 403 on HEAD
+        self.assertTrue(self._check(_client_error("403")))
+
+
+if __name__ == "__main__":
+    unittest.main()